@@ -0,0 +1,87 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+/**
+ * @title Multicall3
+ * @dev Aggregates many read-only calls into a single eth_call
+ * Features:
+ * - Strict aggregation (reverts if any call fails)
+ * - Lenient aggregation with per-call success flags
+ * - ETH balance and block helpers callable as targets in a batch
+ * Gas complexity: O(n) in the number of calls
+ */
+contract Multicall3 {
+    struct Call {
+        address target;
+        bytes callData;
+    }
+
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    /**
+     * @dev Execute all calls, reverting if any of them fails
+     * @param calls Target/calldata pairs
+     * @return blockNumber Block the calls were executed against
+     * @return returnData Raw return data for each call
+     */
+    function aggregate(Call[] calldata calls)
+        external
+        payable
+        returns (uint256 blockNumber, bytes[] memory returnData)
+    {
+        blockNumber = block.number;
+        uint256 length = calls.length;
+        returnData = new bytes[](length);
+        for (uint256 i = 0; i < length; i++) {
+            (bool success, bytes memory ret) = calls[i].target.call(calls[i].callData);
+            require(success, "Multicall3: call failed");
+            returnData[i] = ret;
+        }
+    }
+
+    /**
+     * @dev Execute all calls, optionally tolerating failures
+     * @param requireSuccess Revert if any call fails
+     * @param calls Target/calldata pairs
+     * @return returnData Success flag and raw return data for each call
+     */
+    function tryAggregate(bool requireSuccess, Call[] calldata calls)
+        public
+        payable
+        returns (Result[] memory returnData)
+    {
+        uint256 length = calls.length;
+        returnData = new Result[](length);
+        for (uint256 i = 0; i < length; i++) {
+            (bool success, bytes memory ret) = calls[i].target.call(calls[i].callData);
+            if (requireSuccess) {
+                require(success, "Multicall3: call failed");
+            }
+            returnData[i] = Result(success, ret);
+        }
+    }
+
+    /**
+     * @dev ETH balance of an address
+     */
+    function getEthBalance(address addr) external view returns (uint256 balance) {
+        balance = addr.balance;
+    }
+
+    /**
+     * @dev Current block number
+     */
+    function getBlockNumber() external view returns (uint256 blockNumber) {
+        blockNumber = block.number;
+    }
+
+    /**
+     * @dev Current block timestamp
+     */
+    function getCurrentBlockTimestamp() external view returns (uint256 timestamp) {
+        timestamp = block.timestamp;
+    }
+}
@@ -0,0 +1,70 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+interface IRoundTripToken {
+    function transferFrom(address from, address to, uint256 amount) external returns (bool);
+    function approve(address spender, uint256 amount) external returns (bool);
+}
+
+interface IRoundTripAMM {
+    function tokenA() external view returns (address);
+    function tokenB() external view returns (address);
+    function swapExactTokensForTokens(
+        uint256 amountIn,
+        uint256 amountOutMin,
+        address tokenIn,
+        address to
+    ) external returns (uint256 amountOut);
+}
+
+/**
+ * @title RoundTripArbitrage
+ * @dev Executes both legs of an AMM round trip in one transaction
+ * Features:
+ * - tokenIn -> paired token -> tokenIn through a single AMM pool
+ * - Onchain minimum-output check, so an unprofitable trip reverts as a whole
+ * - Holds no funds between calls
+ * Gas complexity: O(1), two swaps
+ */
+contract RoundTripArbitrage {
+    event RoundTrip(
+        address indexed sender,
+        address indexed amm,
+        address tokenIn,
+        uint256 amountIn,
+        uint256 amountOut
+    );
+
+    /**
+     * @dev Swap tokenIn to the paired token and back, paying the caller
+     * @param amm AMM pool to trade against
+     * @param tokenIn Token the round trip starts and ends in
+     * @param amountIn Amount of tokenIn pulled from the caller (needs approval)
+     * @param minOut Minimum tokenIn returned, e.g. amountIn plus the minimum profit
+     * @return amountOut Amount of tokenIn sent back to the caller
+     */
+    function atomicRoundTrip(
+        address amm,
+        address tokenIn,
+        uint256 amountIn,
+        uint256 minOut
+    ) external returns (uint256 amountOut) {
+        IRoundTripAMM pool = IRoundTripAMM(amm);
+        address tokenA = pool.tokenA();
+        address tokenMid = tokenIn == tokenA ? pool.tokenB() : tokenA;
+
+        require(
+            IRoundTripToken(tokenIn).transferFrom(msg.sender, address(this), amountIn),
+            "RoundTripArbitrage: TRANSFER_FAILED"
+        );
+
+        // First leg stays here; the second pays the caller and enforces minOut
+        IRoundTripToken(tokenIn).approve(amm, amountIn);
+        uint256 midAmount = pool.swapExactTokensForTokens(amountIn, 0, tokenIn, address(this));
+
+        IRoundTripToken(tokenMid).approve(amm, midAmount);
+        amountOut = pool.swapExactTokensForTokens(midAmount, minOut, tokenMid, msg.sender);
+
+        emit RoundTrip(msg.sender, amm, tokenIn, amountIn, amountOut);
+    }
+}
@@ -4,15 +4,22 @@ Blockchain Development Suite - Deployment Script
 Deploys all contracts to Ganache and verifies initial state
 """
 
-import json
+import asyncio
+import hashlib
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from web3 import Web3, HTTPProvider
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from eth_abi import encode
 from eth_account import Account
+from eth_utils.abi import collapse_if_tuple
 from solcx import compile_standard, install_solc, set_solc_version
 import click
-from typing import Dict, Any, Tuple
+import orjson
+from typing import Dict, Any, Optional, Tuple
+
+from simulator.rpc import batch_requests, fee_params, get_web3, sign_transaction_async
 
 # Configuration
 GANACHE_URL = os.getenv('GANACHE_URL', 'http://localhost:8545')
@@ -20,12 +27,195 @@ DEPLOYER_PRIVATE_KEY = os.getenv('DEPLOYER_PRIVATE_KEY',
     '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d')  # Ganache default
 CHAIN_ID = int(os.getenv('CHAIN_ID', '1337'))  # Ganache default
 GAS_LIMIT = int(os.getenv('GAS_LIMIT', '6721975'))
-GAS_PRICE = int(os.getenv('GAS_PRICE', '20000000000'))  # 20 gwei
+GAS_PRICE = int(os.getenv('GAS_PRICE', '20000000000'))  # 20 gwei, pre-London chains only
+MAX_PRIORITY_FEE = int(os.getenv('MAX_PRIORITY_FEE', '1000000000'))  # 1 gwei tip (EIP-1559)
+GAS_ESTIMATE_MARGIN = 1.2  # Headroom over cached per-contract estimates
+POLL_LATENCY = float(os.getenv('POLL_LATENCY', '0.05'))  # Receipt polling interval (s)
+
+# Compiler settings
+SOLC_VERSION = '0.8.19'
+OPTIMIZER_RUNS = 200
+SOLC_CACHE_DIR = Path(__file__).parent / '.solc_cache'
+# Build hash -> {contract name: artifact key} for builds whose every file compiled
+SOLC_MANIFEST_FILE = SOLC_CACHE_DIR / 'manifest.json'
+
+CONTRACTS_DIR = Path(__file__).parent / 'contracts'
+CONTRACT_FILES = [
+    'ERC20Token.sol',
+    'ERC721Token.sol', 
+    'ERC1155Token.sol',
+    'AMM.sol',
+    'Router.sol',
+    'Multicall3.sol',
+    'RoundTripArbitrage.sol'
+]
+
+
+def _source_key(source_code: str) -> str:
+    """Artifact cache key of one source file"""
+    # Key on compiler settings too so a version bump never returns stale output
+    return hashlib.sha256(
+        f"{source_code}|{SOLC_VERSION}|opt={OPTIMIZER_RUNS}".encode()
+    ).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Write to a temp file first so concurrent readers never see partial JSON"""
+    SOLC_CACHE_DIR.mkdir(exist_ok=True)
+    tmp_file = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_file.write_bytes(data)
+    tmp_file.replace(path)
+
+
+def _compile_one(contract_path: Path) -> Tuple[str, Dict[str, Any]]:
+    """Compile a single Solidity file (runs in a worker process)"""
+    contract_file = contract_path.name
+    
+    with open(contract_path, 'r') as f:
+        source_code = f.read()
+    
+    contract_name = contract_file.replace('.sol', '')
+    
+    cache_file = SOLC_CACHE_DIR / f"{_source_key(source_code)}.json"
+    
+    if cache_file.exists():
+        try:
+            return contract_name, orjson.loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass  # Unreadable entry, recompile and overwrite it
+    
+    # Standard JSON input for compilation
+    input_json = {
+        'language': 'Solidity',
+        'sources': {
+            contract_file: {'content': source_code}
+        },
+        'settings': {
+            'outputSelection': {
+                '*': {
+                    '*': ['abi', 'evm.bytecode']
+                }
+            },
+            'optimizer': {
+                'enabled': True,
+                'runs': OPTIMIZER_RUNS
+            }
+        }
+    }
+    
+    # Pass the version explicitly: worker processes don't share solcx globals
+    compiled = compile_standard(input_json, solc_version=SOLC_VERSION)
+    contract_data = compiled['contracts'][contract_file][contract_name]
+    
+    artifact = {
+        'abi': contract_data['abi'],
+        'bytecode': contract_data['evm']['bytecode']['object']
+    }
+    
+    _write_atomic(cache_file, orjson.dumps(artifact))
+    
+    return contract_name, artifact
+
+
+def _load_build(build_key: str) -> Optional[Dict[str, Any]]:
+    """Artifacts of a build recorded in the manifest, or None if any is missing"""
+    try:
+        entry = orjson.loads(SOLC_MANIFEST_FILE.read_bytes())[build_key]
+        return {
+            contract_name: orjson.loads((SOLC_CACHE_DIR / f"{cache_key}.json").read_bytes())
+            for contract_name, cache_key in entry.items()
+        }
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _record_build(build_key: str, source_keys: Dict[str, str]):
+    """Add a fully compiled build to the manifest"""
+    try:
+        manifest = orjson.loads(SOLC_MANIFEST_FILE.read_bytes())
+    except (OSError, ValueError):
+        manifest = {}
+    manifest[build_key] = source_keys
+    _write_atomic(SOLC_MANIFEST_FILE, orjson.dumps(manifest))
+
+
+def compile_contracts() -> Dict[str, Any]:
+    """
+    Compile all Solidity contracts
+    Needs no node connection, so tests can compile once per session
+    """
+    compiled_contracts = {}
+    
+    contract_paths = []
+    for contract_file in CONTRACT_FILES:
+        contract_path = CONTRACTS_DIR / contract_file
+        if not contract_path.exists():
+            print(f"⚠️  Contract file not found: {contract_path}")
+            continue
+        contract_paths.append(contract_path)
+    
+    if not contract_paths:
+        return compiled_contracts
+    
+    # An unchanged set of sources loads straight from the cache, without
+    # installing solc or starting workers
+    source_keys = {
+        contract_path.stem: _source_key(contract_path.read_text())
+        for contract_path in contract_paths
+    }
+    build_key = hashlib.sha256(
+        '|'.join(f"{name}={key}" for name, key in sorted(source_keys.items())).encode()
+    ).hexdigest()
+    cached = _load_build(build_key)
+    if cached is not None:
+        print(f"🔨 Loaded {len(cached)} compiled contracts from {SOLC_CACHE_DIR}")
+        return cached
+    
+    print("🔨 Compiling contracts...")
+    
+    # Install and set Solidity version once, before fanning out
+    install_solc(SOLC_VERSION)
+    set_solc_version(SOLC_VERSION)
+    
+    # Each solc invocation is an independent native process, so compile
+    # the files concurrently
+    max_workers = min(len(contract_paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_compile_one, contract_path): contract_path
+            for contract_path in contract_paths
+        }
+        
+        for future in as_completed(futures):
+            contract_file = futures[future].name
+            try:
+                contract_name, contract_data = future.result()
+                compiled_contracts[contract_name] = contract_data
+                print(f"✅ Compiled {contract_name}")
+                
+            except Exception as e:
+                print(f"❌ Failed to compile {contract_file}: {e}")
+    
+    # Only complete builds are recorded; a failed file is retried next time
+    if len(compiled_contracts) == len(contract_paths):
+        _record_build(build_key, source_keys)
+            
+    return compiled_contracts
+
 
 class ContractDeployer:
-    def __init__(self, web3_url: str = GANACHE_URL):
-        """Initialize deployer with Web3 connection"""
-        self.w3 = Web3(HTTPProvider(web3_url))
+    def __init__(self, web3_url: str = GANACHE_URL, poll_latency: float = POLL_LATENCY):
+        """
+        Initialize deployer with Web3 connection
+        
+        Args:
+            web3_url: RPC URL of the node
+            poll_latency: Seconds between receipt polls (0.01 suits instamine nodes)
+        """
+        self.w3 = get_web3(web3_url)
+        # Deployments are submitted concurrently through the async client
+        self.async_w3 = AsyncWeb3(AsyncHTTPProvider(web3_url))
+        self.poll_latency = poll_latency
         
         if not self.w3.is_connected():
             raise Exception(f"❌ Cannot connect to {web3_url}")
@@ -43,97 +233,74 @@ class ContractDeployer:
         print(f"💰 Balance: {self.w3.from_wei(balance, 'ether')} ETH")
         
         self.deployed_contracts = {}
+        self.token_decimals: Dict[str, int] = {}  # deployment name -> decimals
         self.nonce = self.w3.eth.get_transaction_count(self.deployer_address)
         
+        # Type-2 fees when the chain has a base fee, legacy gasPrice otherwise
+        self.fee_params = fee_params(self.w3.eth.get_block('latest'), MAX_PRIORITY_FEE, GAS_PRICE)
+        self._deploy_gas_cache: Dict[str, int] = {}  # bytecode -> gas limit
+        
     def compile_contracts(self) -> Dict[str, Any]:
         """Compile all Solidity contracts"""
-        print("🔨 Compiling contracts...")
-        
-        # Install and set Solidity version
-        install_solc('0.8.19')
-        set_solc_version('0.8.19')
-        
-        contracts_dir = Path(__file__).parent / 'contracts'
-        compiled_contracts = {}
-        
-        # Contract files to compile
-        contract_files = [
-            'ERC20Token.sol',
-            'ERC721Token.sol', 
-            'ERC1155Token.sol',
-            'AMM.sol',
-            'Router.sol'
-        ]
-        
-        for contract_file in contract_files:
-            contract_path = contracts_dir / contract_file
-            if not contract_path.exists():
-                print(f"⚠️  Contract file not found: {contract_path}")
-                continue
-                
-            with open(contract_path, 'r') as f:
-                source_code = f.read()
-            
-            # Standard JSON input for compilation
-            input_json = {
-                'language': 'Solidity',
-                'sources': {
-                    contract_file: {'content': source_code}
-                },
-                'settings': {
-                    'outputSelection': {
-                        '*': {
-                            '*': ['abi', 'evm.bytecode']
-                        }
-                    },
-                    'optimizer': {
-                        'enabled': True,
-                        'runs': 200
-                    }
-                }
-            }
-            
-            try:
-                compiled = compile_standard(input_json)
-                contract_name = contract_file.replace('.sol', '')
-                contract_data = compiled['contracts'][contract_file][contract_name]
-                
-                compiled_contracts[contract_name] = {
-                    'abi': contract_data['abi'],
-                    'bytecode': contract_data['evm']['bytecode']['object']
-                }
-                print(f"✅ Compiled {contract_name}")
-                
-            except Exception as e:
-                print(f"❌ Failed to compile {contract_file}: {e}")
-                
-        return compiled_contracts
+        return compile_contracts()
+    
+    def _reserve_nonces(self, n: int) -> range:
+        """Reserve a contiguous block of nonces for concurrent submissions"""
+        nonces = range(self.nonce, self.nonce + n)
+        self.nonce += n
+        return nonces
+    
+    async def _estimate_deploy_gas(self, bytecode: str, constructor_tx: Dict[str, Any]) -> int:
+        """Estimate deployment gas once per contract type (keyed by bytecode)"""
+        if bytecode not in self._deploy_gas_cache:
+            estimate = await self.async_w3.eth.estimate_gas({
+                'from': constructor_tx['from'],
+                'data': constructor_tx['data']
+            })
+            self._deploy_gas_cache[bytecode] = min(GAS_LIMIT, int(estimate * GAS_ESTIMATE_MARGIN))
+        return self._deploy_gas_cache[bytecode]
     
-    def deploy_contract(self, name: str, abi: list, bytecode: str, 
-                       constructor_args: tuple = ()) -> Tuple[str, Any]:
+    async def deploy_contract(self, name: str, abi: list, bytecode: str, 
+                              constructor_args: tuple = (),
+                              nonce: Optional[int] = None) -> Tuple[str, Any]:
         """Deploy a single contract"""
         print(f"🚀 Deploying {name}...")
         
-        # Create contract instance
-        contract = self.w3.eth.contract(abi=abi, bytecode=bytecode)
+        if nonce is None:
+            nonce = self._reserve_nonces(1)[0]
+        
+        # Encode constructor calldata directly rather than through contract.constructor()
+        constructor_abi = next((item for item in abi if item['type'] == 'constructor'), None)
+        data = bytes.fromhex(bytecode[2:] if bytecode.startswith('0x') else bytecode)
+        if constructor_abi and constructor_abi['inputs']:
+            arg_types = [collapse_if_tuple(arg) for arg in constructor_abi['inputs']]
+            data += encode(arg_types, list(constructor_args))
+            
+            # Decimals are immutable, so record them for agents to skip the RPC
+            for arg, value in zip(constructor_abi['inputs'], constructor_args):
+                if arg['name'].strip('_') == 'decimals':
+                    self.token_decimals[name] = value
         
         # Build constructor transaction
-        constructor_tx = contract.constructor(*constructor_args).build_transaction({
+        constructor_tx = {
             'from': self.deployer_address,
-            'nonce': self.nonce,
-            'gas': GAS_LIMIT,
-            'gasPrice': GAS_PRICE,
-            'chainId': CHAIN_ID
-        })
+            'data': data,
+            'nonce': nonce,
+            'chainId': CHAIN_ID,
+            **self.fee_params
+        }
+        constructor_tx['gas'] = await self._estimate_deploy_gas(bytecode, constructor_tx)
         
         # Sign and send transaction
-        signed_tx = self.account.sign_transaction(constructor_tx)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        signed_tx = await sign_transaction_async(self.account, constructor_tx)
+        tx_hash = await self.async_w3.eth.send_raw_transaction(signed_tx.rawTransaction)
         
         print(f"📝 Transaction hash: {tx_hash.hex()}")
         
         # Wait for transaction receipt
-        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        tx_receipt = await self.async_w3.eth.wait_for_transaction_receipt(
+            tx_hash, timeout=120, poll_latency=self.poll_latency
+        )
         
         if tx_receipt.status == 0:
             raise Exception(f"❌ Transaction failed for {name}")
@@ -144,68 +311,96 @@ class ContractDeployer:
         print(f"✅ {name} deployed at {contract_address}")
         print(f"⛽ Gas used: {tx_receipt.gasUsed:,}")
         
-        self.nonce += 1
-        
         return contract_address, deployed_contract
     
-    def deploy_erc20_token(self, compiled_contracts: Dict[str, Any]) -> Tuple[str, Any]:
+    async def deploy_erc20_token(self, compiled_contracts: Dict[str, Any],
+                                 nonce: Optional[int] = None) -> Tuple[str, Any]:
         """Deploy ERC20 token contract"""
         name = "Test Token"
         symbol = "TEST"
         decimals = 18
         initial_supply = self.w3.to_wei(1000000, 'ether')  # 1M tokens
         
-        return self.deploy_contract(
+        return await self.deploy_contract(
             'ERC20Token',
             compiled_contracts['ERC20Token']['abi'],
             compiled_contracts['ERC20Token']['bytecode'],
-            (name, symbol, decimals, initial_supply)
+            (name, symbol, decimals, initial_supply),
+            nonce
         )
     
-    def deploy_erc721_token(self, compiled_contracts: Dict[str, Any]) -> Tuple[str, Any]:
+    async def deploy_erc721_token(self, compiled_contracts: Dict[str, Any],
+                                  nonce: Optional[int] = None) -> Tuple[str, Any]:
         """Deploy ERC721 NFT contract"""
         name = "Test NFT"
         symbol = "TNFT"
         
-        return self.deploy_contract(
+        return await self.deploy_contract(
             'ERC721Token',
             compiled_contracts['ERC721Token']['abi'],
             compiled_contracts['ERC721Token']['bytecode'],
-            (name, symbol)
+            (name, symbol),
+            nonce
         )
     
-    def deploy_erc1155_token(self, compiled_contracts: Dict[str, Any]) -> Tuple[str, Any]:
+    async def deploy_erc1155_token(self, compiled_contracts: Dict[str, Any],
+                                   nonce: Optional[int] = None) -> Tuple[str, Any]:
         """Deploy ERC1155 multi-token contract"""
         name = "Test Multi-Token"
         symbol = "TMT"
         base_uri = "https://api.example.com/metadata/{id}.json"
         
-        return self.deploy_contract(
+        return await self.deploy_contract(
             'ERC1155Token',
             compiled_contracts['ERC1155Token']['abi'],
             compiled_contracts['ERC1155Token']['bytecode'],
-            (name, symbol, base_uri)
+            (name, symbol, base_uri),
+            nonce
         )
     
-    def deploy_amm(self, compiled_contracts: Dict[str, Any], 
-                   token_a_address: str, token_b_address: str) -> Tuple[str, Any]:
+    async def deploy_amm(self, compiled_contracts: Dict[str, Any], 
+                         token_a_address: str, token_b_address: str,
+                         nonce: Optional[int] = None) -> Tuple[str, Any]:
         """Deploy AMM contract for token pair"""
         name = f"AMM-LP-{token_a_address[:6]}-{token_b_address[:6]}"
         symbol = f"ALP-{token_a_address[:4]}{token_b_address[:4]}"
         
-        return self.deploy_contract(
+        return await self.deploy_contract(
             'AMM',
             compiled_contracts['AMM']['abi'],
             compiled_contracts['AMM']['bytecode'],
-            (token_a_address, token_b_address, name, symbol)
+            (token_a_address, token_b_address, name, symbol),
+            nonce
         )
     
-    def deploy_router(self, compiled_contracts: Dict[str, Any]) -> Tuple[str, Any]:
+    async def deploy_router(self, compiled_contracts: Dict[str, Any],
+                            nonce: Optional[int] = None) -> Tuple[str, Any]:
         """Deploy Router contract"""
-        return self.deploy_contract(
+        return await self.deploy_contract(
             'Router',
             compiled_contracts['Router']['abi'],
-            compiled_contracts['Router']['bytecode']
+            compiled_contracts['Router']['bytecode'],
+            nonce=nonce
+        )
+    
+    async def deploy_multicall(self, compiled_contracts: Dict[str, Any],
+                               nonce: Optional[int] = None) -> Tuple[str, Any]:
+        """Deploy Multicall3 aggregator used for batched agent reads"""
+        return await self.deploy_contract(
+            'Multicall3',
+            compiled_contracts['Multicall3']['abi'],
+            compiled_contracts['Multicall3']['bytecode'],
+            nonce=nonce
+        )
+    
+    async def deploy_round_trip_arbitrage(self, compiled_contracts: Dict[str, Any],
+                                          nonce: Optional[int] = None) -> Tuple[str, Any]:
+        """Deploy the helper that runs both legs of an arbitrage round trip atomically"""
+        return await self.deploy_contract(
+            'RoundTripArbitrage',
+            compiled_contracts['RoundTripArbitrage']['abi'],
+            compiled_contracts['RoundTripArbitrage']['bytecode'],
+            nonce=nonce
         )
     
     def verify_deployments(self) -> bool:
@@ -213,13 +408,35 @@ class ContractDeployer:
         print("🔍 Verifying deployments...")
         
         try:
-            # Verify ERC20 token
             erc20 = self.deployed_contracts['ERC20Token']['contract']
-            name = erc20.functions.name().call()
-            symbol = erc20.functions.symbol().call()
-            total_supply = erc20.functions.totalSupply().call()
-            balance = erc20.functions.balanceOf(self.deployer_address).call()
+            erc721 = self.deployed_contracts['ERC721Token']['contract']
+            erc1155 = self.deployed_contracts['ERC1155Token']['contract']
+            amm = self.deployed_contracts['AMM']['contract']
+            router = self.deployed_contracts['Router']['contract']
+            
+            # Fetch every view in one JSON-RPC batch instead of a round trip each
+            with batch_requests(self.w3) as batch:
+                batch.add_call(erc20, 'name')
+                batch.add_call(erc20, 'symbol')
+                batch.add_call(erc20, 'totalSupply')
+                batch.add_call(erc20, 'balanceOf', self.deployer_address)
+                batch.add_call(erc721, 'name')
+                batch.add_call(erc721, 'symbol')
+                batch.add_call(erc721, 'MAX_SUPPLY')
+                batch.add_call(erc1155, 'name')
+                batch.add_call(erc1155, 'symbol')
+                batch.add_call(amm, 'tokenA')
+                batch.add_call(amm, 'tokenB')
+                batch.add_call(amm, 'fee')
+                batch.add_call(router, 'allPairsLength')
+                
+                (name, symbol, total_supply, balance,
+                 nft_name, nft_symbol, max_supply,
+                 multi_name, multi_symbol,
+                 token_a, token_b, fee,
+                 pairs_count) = batch.execute()
             
+            # Verify ERC20 token
             print(f"✅ ERC20 Token: {name} ({symbol})")
             print(f"   Total Supply: {self.w3.from_wei(total_supply, 'ether'):,} {symbol}")
             print(f"   Deployer Balance: {self.w3.from_wei(balance, 'ether'):,} {symbol}")
@@ -228,36 +445,19 @@ class ContractDeployer:
             assert balance == total_supply, "Deployer should own all initial tokens"
             
             # Verify ERC721 token
-            erc721 = self.deployed_contracts['ERC721Token']['contract']
-            nft_name = erc721.functions.name().call()
-            nft_symbol = erc721.functions.symbol().call()
-            max_supply = erc721.functions.MAX_SUPPLY().call()
-            
             print(f"✅ ERC721 NFT: {nft_name} ({nft_symbol})")
             print(f"   Max Supply: {max_supply:,}")
             
             # Verify ERC1155 token
-            erc1155 = self.deployed_contracts['ERC1155Token']['contract']
-            multi_name = erc1155.functions.name().call()
-            multi_symbol = erc1155.functions.symbol().call()
-            
             print(f"✅ ERC1155 Multi-Token: {multi_name} ({multi_symbol})")
             
             # Verify AMM
-            amm = self.deployed_contracts['AMM']['contract']
-            token_a = amm.functions.tokenA().call()
-            token_b = amm.functions.tokenB().call()
-            fee = amm.functions.fee().call()
-            
             print(f"✅ AMM Contract:")
             print(f"   Token A: {token_a}")
             print(f"   Token B: {token_b}")
             print(f"   Fee: {fee / 100:.2f}%")
             
             # Verify Router
-            router = self.deployed_contracts['Router']['contract']
-            pairs_count = router.functions.allPairsLength().call()
-            
             print(f"✅ Router Contract:")
             print(f"   Pairs Count: {pairs_count}")
             
@@ -288,72 +488,69 @@ class ContractDeployer:
                 'transactionHash': info.get('tx_hash', ''),
                 'blockNumber': info.get('block_number', 0)
             }
+            if name in self.token_decimals:
+                deployment_info['contracts'][name]['decimals'] = self.token_decimals[name]
         
-        with open(output_file, 'w') as f:
-            json.dump(deployment_info, f, indent=2)
+        Path(output_file).write_bytes(
+            orjson.dumps(deployment_info, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        )
             
         print(f"📄 Deployment info saved to {output_file}")
     
     def deploy_all(self) -> bool:
         """Deploy all contracts in correct order"""
+        return asyncio.run(self.deploy_all_async())
+    
+    async def deploy_all_async(self) -> bool:
+        """Deploy independent contracts concurrently, then the AMM that needs them"""
         try:
             # Compile contracts
             compiled_contracts = self.compile_contracts()
             
-            # Deploy ERC20 token (will be used in AMM)
-            erc20_address, erc20_contract = self.deploy_erc20_token(compiled_contracts)
-            self.deployed_contracts['ERC20Token'] = {
-                'address': erc20_address,
-                'contract': erc20_contract,
-                'abi': compiled_contracts['ERC20Token']['abi']
-            }
+            # Every task owns its nonce up front, so submission order between
+            # the concurrent deployments doesn't matter
+            nonces = self._reserve_nonces(8)
             
-            # Deploy second ERC20 token for AMM pair
-            usdc_address, usdc_contract = self.deploy_contract(
-                'USDC',
-                compiled_contracts['ERC20Token']['abi'],
-                compiled_contracts['ERC20Token']['bytecode'],
-                ("USD Coin", "USDC", 6, self.w3.to_wei(1000000, 'mwei'))  # 1M USDC (6 decimals)
+            # Only the AMM depends on other deployments (the ERC20/USDC pair)
+            erc20, usdc, erc721, erc1155, router, multicall, round_trip = await asyncio.gather(
+                self.deploy_erc20_token(compiled_contracts, nonce=nonces[0]),
+                # Second ERC20 token for AMM pair
+                self.deploy_contract(
+                    'USDC',
+                    compiled_contracts['ERC20Token']['abi'],
+                    compiled_contracts['ERC20Token']['bytecode'],
+                    ("USD Coin", "USDC", 6, self.w3.to_wei(1000000, 'mwei')),  # 1M USDC (6 decimals)
+                    nonce=nonces[1]
+                ),
+                self.deploy_erc721_token(compiled_contracts, nonce=nonces[2]),
+                self.deploy_erc1155_token(compiled_contracts, nonce=nonces[3]),
+                self.deploy_router(compiled_contracts, nonce=nonces[4]),
+                self.deploy_multicall(compiled_contracts, nonce=nonces[5]),
+                self.deploy_round_trip_arbitrage(compiled_contracts, nonce=nonces[6])
             )
-            self.deployed_contracts['USDC'] = {
-                'address': usdc_address,
-                'contract': usdc_contract,
-                'abi': compiled_contracts['ERC20Token']['abi']
-            }
-            
-            # Deploy ERC721 NFT
-            erc721_address, erc721_contract = self.deploy_erc721_token(compiled_contracts)
-            self.deployed_contracts['ERC721Token'] = {
-                'address': erc721_address,
-                'contract': erc721_contract,
-                'abi': compiled_contracts['ERC721Token']['abi']
-            }
-            
-            # Deploy ERC1155 Multi-Token
-            erc1155_address, erc1155_contract = self.deploy_erc1155_token(compiled_contracts)
-            self.deployed_contracts['ERC1155Token'] = {
-                'address': erc1155_address,
-                'contract': erc1155_contract,
-                'abi': compiled_contracts['ERC1155Token']['abi']
-            }
             
             # Deploy AMM for ERC20/USDC pair
-            amm_address, amm_contract = self.deploy_amm(
-                compiled_contracts, erc20_address, usdc_address
+            amm = await self.deploy_amm(
+                compiled_contracts, erc20[0], usdc[0], nonce=nonces[7]
             )
-            self.deployed_contracts['AMM'] = {
-                'address': amm_address,
-                'contract': amm_contract,
-                'abi': compiled_contracts['AMM']['abi']
-            }
             
-            # Deploy Router
-            router_address, router_contract = self.deploy_router(compiled_contracts)
-            self.deployed_contracts['Router'] = {
-                'address': router_address,
-                'contract': router_contract,
-                'abi': compiled_contracts['Router']['abi']
+            # Deployment name -> (compiled artifact, (address, contract))
+            deployments = {
+                'ERC20Token': ('ERC20Token', erc20),
+                'USDC': ('ERC20Token', usdc),
+                'ERC721Token': ('ERC721Token', erc721),
+                'ERC1155Token': ('ERC1155Token', erc1155),
+                'AMM': ('AMM', amm),
+                'Router': ('Router', router),
+                'Multicall3': ('Multicall3', multicall),
+                'RoundTripArbitrage': ('RoundTripArbitrage', round_trip)
             }
+            for name, (artifact, (address, contract)) in deployments.items():
+                self.deployed_contracts[name] = {
+                    'address': address,
+                    'contract': contract,
+                    'abi': compiled_contracts[artifact]['abi']
+                }
             
             # Verify deployments
             if not self.verify_deployments():
@@ -380,8 +577,7 @@ def main(ganache_url: str, output: str, verify_only: bool):
     if verify_only:
         # Load existing deployment and verify
         try:
-            with open(output, 'r') as f:
-                deployment_info = json.load(f)
+            deployment_info = orjson.loads(Path(output).read_bytes())
             print("🔍 Verifying existing deployments...")
             # TODO: Add verification logic for existing deployments
             print("✅ Verification complete")
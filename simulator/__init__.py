@@ -0,0 +1,43 @@
+"""
+Blockchain Development Suite - Simulation Package
+"""
+
+import importlib
+
+__version__ = "1.0.0"
+__author__ = "Blockchain Dev Suite"
+
+# Public name -> defining submodule; loaded on first access (PEP 562) so that
+# importing one submodule (e.g. ``simulator.rpc``) doesn't pull in the rest
+_LAZY = {
+    'AgentBase': '.agent_base',
+    'MarketMaker': '.market_maker',
+    'Trader': '.trader',
+    'MomentumTrader': '.trader',
+    'RandomTrader': '.trader',
+    'SimulationRunner': '.run_simulation',
+    'MetricsCalculator': '.metrics'
+}
+
+__all__ = [
+    'AgentBase',
+    'MarketMaker', 
+    'Trader',
+    'MomentumTrader',
+    'RandomTrader',
+    'SimulationRunner',
+    'MetricsCalculator'
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
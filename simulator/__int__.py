@@ -1,22 +0,0 @@
-"""
-Blockchain Development Suite - Simulation Package
-"""
-
-__version__ = "1.0.0"
-__author__ = "Blockchain Dev Suite"
-
-from .agent_base import AgentBase
-from .market_maker import MarketMaker
-from .trader import Trader, MomentumTrader, RandomTrader
-from .run_simulation import SimulationRunner
-from .metrics import MetricsCalculator
-
-__all__ = [
-    'AgentBase',
-    'MarketMaker', 
-    'Trader',
-    'MomentumTrader',
-    'RandomTrader',
-    'SimulationRunner',
-    'MetricsCalculator'
-]
\ No newline at end of file
@@ -4,16 +4,191 @@ Base Agent Class for Blockchain Simulation
 Provides common functionality for all trading agents
 """
 
+import functools
 import random
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Callable, Iterable, Optional, List, Tuple
+import numpy as np
 from web3 import Web3
+from web3.contract import Contract
+from eth_abi import decode
+from eth_abi.registry import registry as abi_registry
 from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from eth_utils import function_signature_to_4byte_selector
+from hexbytes import HexBytes
 import json
 import logging
 
+from .rpc import batch_requests, fee_params
+
 logger = logging.getLogger(__name__)
 
+# Receipt polling interval; Ganache mines instantly so poll tightly
+DEFAULT_POLL_LATENCY = 0.05
+
+# Function selectors for the fixed-signature calls agents make directly
+APPROVE_SEL = function_signature_to_4byte_selector('approve(address,uint256)')
+TRANSFER_SEL = function_signature_to_4byte_selector('transfer(address,uint256)')
+BALANCE_OF_SEL = function_signature_to_4byte_selector('balanceOf(address)')
+DECIMALS_SEL = function_signature_to_4byte_selector('decimals()')
+ALLOWANCE_SEL = function_signature_to_4byte_selector('allowance(address,address)')
+AGGREGATE_SEL = function_signature_to_4byte_selector('aggregate((address,bytes)[])')
+GET_ETH_BALANCE_SEL = function_signature_to_4byte_selector('getEthBalance(address)')
+GET_BLOCK_NUMBER_SEL = function_signature_to_4byte_selector('getBlockNumber()')
+GET_BLOCK_TIMESTAMP_SEL = function_signature_to_4byte_selector('getCurrentBlockTimestamp()')
+
+# Encoders resolved once from the eth_abi registry; encode() would parse the
+# type strings and look these up again on every call
+_enc_addr = abi_registry.get_encoder('(address)')
+_enc_addr_uint = abi_registry.get_encoder('(address,uint256)')
+_enc_addr_addr = abi_registry.get_encoder('(address,address)')
+_enc_calls = abi_registry.get_encoder('((address,bytes)[])')
+
+MAX_UINT256 = 2**256 - 1
+
+# Trade log columns start at TRADE_HISTORY_INITIAL records and double as
+# needed; past the agent's capacity (default TRADE_HISTORY_CAPACITY) the
+# oldest records are overwritten. Amounts are raw token units as float64;
+# integers float64 would round (most wei amounts) are also kept exactly in a
+# side table, see AgentBase.trade_amounts
+TRADE_HISTORY_INITIAL = 256
+TRADE_HISTORY_CAPACITY = 1 << 20
+TRADE_DTYPE = np.dtype([
+    ('timestamp', 'i8'),
+    ('block_number', 'u8'),
+    ('trade_type', 'u1'),
+    ('amount', 'f8')
+])
+
+# Tip per gas for EIP-1559 transactions (wei)
+DEFAULT_PRIORITY_FEE = 1_000_000_000
+
+# Seconds before fee parameters are refreshed from the latest block
+FEE_CACHE_TTL = 5.0
+
+# Cached gas estimates are scaled by this to cover argument-dependent costs
+GAS_ESTIMATE_MULTIPLIER = 2
+
+# Fee fields that send_transaction owns
+FEE_FIELDS = ('gasPrice', 'maxFeePerGas', 'maxPriorityFeePerGas', 'type')
+
+# Uniform draws pre-generated per refill of an agent's scalar RNG buffer
+RNG_BATCH_SIZE = 4096
+
+# Detail keys holding the traded amount, by precedence
+TRADE_AMOUNT_KEYS = ('amount_in', 'amount_a', 'lp_amount', 'amount')
+
+# Derived accounts by private key. LocalAccount is effectively read-only once
+# built, so agents (and threads) reusing a key can safely share one instance
+_ACCOUNT_CACHE: Dict[str, LocalAccount] = {}
+
+def get_account(private_key: str) -> LocalAccount:
+    """Get the account for a private key, deriving it only once"""
+    account = _ACCOUNT_CACHE.get(private_key)
+    if account is None:
+        account = _ACCOUNT_CACHE[private_key] = Account.from_key(private_key)
+    return account
+
+@functools.lru_cache(maxsize=256)
+def _get_contract(w3: Web3, address: str, abi_key: Tuple) -> Contract:
+    return w3.eth.contract(address=address, abi=_abi_from_key(abi_key))
+
+def _abi_key(abi: list) -> Tuple:
+    """Hashable form of an ABI: its entries as sorted canonical JSON strings"""
+    return tuple(sorted(json.dumps(entry, sort_keys=True) for entry in abi))
+
+def _abi_from_key(abi_key: Tuple) -> list:
+    return [json.loads(entry) for entry in abi_key]
+
+def get_contract(w3: Web3, address: str, abi: list) -> Contract:
+    """
+    Get a contract instance shared by every agent using the same address and ABI
+    Building a contract parses its ABI, which adds up across many agents
+    """
+    return _get_contract(w3, address, _abi_key(abi))
+
+def multicall(w3: Web3, multicall_address: str, calls: List[Tuple[str, bytes]]) -> List[bytes]:
+    """
+    Execute read-only calls through Multicall3 in a single eth_call
+    
+    Args:
+        w3: Web3 instance
+        multicall_address: Deployed Multicall3 address
+        calls: (target address, calldata) pairs
+        
+    Returns:
+        Raw return data for each call, in order
+    """
+    data = AGGREGATE_SEL + _enc_calls((calls,))
+    raw = w3.eth.call({'to': multicall_address, 'data': data})
+    _, return_data = decode(['uint256', 'bytes[]'], raw)
+    return list(return_data)
+
+class TransactionFailedError(Exception):
+    """A transaction was mined but reverted (receipt status 0)"""
+
+
+class NonceState:
+    """
+    Next nonce of one account, shared by every agent that signs with it
+    The lock is held from nonce assignment until the node accepts the
+    transaction, so agents stepping concurrently on one account can't race
+    """
+    
+    def __init__(self, nonce: int):
+        self.lock = threading.RLock()
+        self.value = nonce
+
+class GeneratorRandom(random.Random):
+    """
+    random.Random API drawing from a NumPy Generator
+    Every other method (uniform, randint, choice, shuffle, ...) is built on
+    random() and getrandbits(), so all draws come from the one generator
+    """
+    
+    def __init__(self, rng: np.random.Generator):
+        self._rng = rng
+        super().__init__()
+    
+    def seed(self, *args, **kwargs):
+        """No-op; the wrapped generator is seeded by its owner"""
+    
+    def random(self) -> float:
+        return float(self._rng.random())
+    
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        return int.from_bytes(self._rng.bytes((k + 7) // 8), 'little') >> (-k % 8)
+
+class TokenRegistry:
+    """
+    Fixed ordering of token symbols
+    Lets balances live in a flat float64 array instead of a dict
+    """
+    
+    def __init__(self, symbols: Iterable[str]):
+        self.symbols = tuple(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def to_array(self, balances: Dict[str, float]) -> np.ndarray:
+        """Pack a symbol -> amount mapping into registry order (missing = 0)"""
+        return np.fromiter(
+            (float(balances.get(symbol, 0.0)) for symbol in self.symbols),
+            dtype=np.float64,
+            count=len(self.symbols)
+        )
+    
+    def to_dict(self, array: np.ndarray) -> Dict[str, float]:
+        """Unpack a registry-ordered array back into a mapping"""
+        return {symbol: float(value) for symbol, value in zip(self.symbols, array)}
+
 class AgentBase(ABC):
     """
     Base class for all simulation agents
@@ -26,7 +201,9 @@ class AgentBase(ABC):
                  w3: Web3,
                  contracts: Dict[str, Any],
                  initial_balance: Dict[str, float] = None,
-                 random_seed: Optional[int] = None):
+                 random_seed: Optional[int] = None,
+                 poll_latency: float = DEFAULT_POLL_LATENCY,
+                 trade_history_capacity: int = TRADE_HISTORY_CAPACITY):
         """
         Initialize base agent
         
@@ -37,182 +214,613 @@ class AgentBase(ABC):
             contracts: Dictionary of deployed contracts
             initial_balance: Initial token balances
             random_seed: Seed for deterministic randomness
+            poll_latency: Seconds between receipt polls
+            trade_history_capacity: Most trades kept in trade_history
         """
         self.agent_id = agent_id
         self.w3 = w3
         self.contracts = contracts
-        self.account = Account.from_key(private_key)
+        self.account = get_account(private_key)
         self.address = self.account.address
+        # Bound once; every RPC helper goes through these
+        self._eth = self.w3.eth
+        self._owner_word = _enc_addr((self.address,))
         
-        # Setup deterministic randomness
-        if random_seed is not None:
-            self.random = random.Random(random_seed)
-        else:
-            self.random = random.Random()
+        # Setup deterministic randomness; scalar draws come from a pre-drawn batch
+        self.rng = np.random.default_rng(random_seed)
+        self._uniform_buf = np.empty(0)
+        self._uniform_pos = 0
+        # Kept for callers of the old random.Random API; draws from self.rng
+        self.random = GeneratorRandom(self.rng)
             
         # Transaction management
-        self.nonce = self.w3.eth.get_transaction_count(self.address)
-        self.gas_limit = 500000
-        self.gas_price = self.w3.to_wei('20', 'gwei')
+        self._nonce_state = NonceState(self.w3.eth.get_transaction_count(self.address))
+        self.gas_limit = 500000  # Upper bound for estimates
+        self.gas_price = self.w3.to_wei('20', 'gwei')  # Used on pre-London chains
+        self.fee_params = fee_params(
+            self.w3.eth.get_block('latest'), DEFAULT_PRIORITY_FEE, self.gas_price
+        )
+        self._fee_fetched_at = time.monotonic()
+        self._gas_cache: Dict[Tuple[str, bytes], int] = {}
+        self.poll_latency = poll_latency
+        # (number, timestamp) that per-block read memos are keyed on; seeded by
+        # the runner each step and dropped whenever this agent mines a block
+        self._block_cache: Optional[Tuple[int, int]] = None
+        self.chain_id = self.w3.eth.chain_id
+        
+        # Multicall3 aggregator (optional, older deployments don't include it)
+        multicall_info = self.contracts.get('Multicall3')
+        self.multicall_address = multicall_info['address'] if multicall_info else None
+        
+        # Per-token caches; ABIs and decimals never change during a run
+        self._token_contract_cache: Dict[str, Contract] = {}
+        self._balance_of_fns: Dict[str, Any] = {}
+        # Known remaining allowance per (token, spender); only this agent spends it
+        self._allowance: Dict[Tuple[str, str], int] = {}
+        self._decimals_cache: Dict[str, int] = {
+            info['address']: info['decimals']
+            for info in self.contracts.values()
+            if 'decimals' in info
+        }
         
         # Performance tracking
         self.pnl = 0.0
         self.total_gas_used = 0
         self.transaction_count = 0
-        self.trade_history = []
         
-        # Initial balances
+        # Trade log as growable columns; oldest records are overwritten at capacity
+        self._trades_cap = max(1, trade_history_capacity)
+        self._trades_size = min(TRADE_HISTORY_INITIAL, self._trades_cap)
+        self._trades = {
+            name: np.empty(self._trades_size, dtype=TRADE_DTYPE[name])
+            for name in TRADE_DTYPE.names
+        }
+        self._trades_n = 0
+        # Exact amount by slot, only for amounts the float64 column rounds
+        self._trades_exact: Dict[int, int] = {}
+        self._type_interner: Dict[str, int] = {}
+        
+        # Initial balances; PnL is tracked over the tokens the agent started with
         self.initial_balances = initial_balance or {}
+        self.token_registry = TokenRegistry(self.initial_balances)
+        self.initial_balances_arr = self.token_registry.to_array(self.initial_balances)
+        self.balances = self.initial_balances_arr.copy()
         
-        logger.info(f"🤖 Agent {self.agent_id} initialized with address {self.address}")
+        logger.info("🤖 Agent %s initialized with address %s", self.agent_id, self.address)
+    
+    def rand_uniform(self, n: int) -> np.ndarray:
+        """Draw n uniform floats in [0, 1)"""
+        return self.rng.random(n)
+    
+    def rand_choice(self, options: List[Any], size: int) -> List[Any]:
+        """Draw size elements from options uniformly, with replacement"""
+        return [options[i] for i in self.rng.integers(len(options), size=size)]
+    
+    def next_uniform(self) -> float:
+        """Next uniform float in [0, 1) from the pre-drawn batch"""
+        if self._uniform_pos >= len(self._uniform_buf):
+            self._uniform_buf = self.rng.random(RNG_BATCH_SIZE)
+            self._uniform_pos = 0
+        value = self._uniform_buf[self._uniform_pos]
+        self._uniform_pos += 1
+        return float(value)
+    
+    @staticmethod
+    def scale_uniform(u: float, low: int, high: int) -> int:
+        """
+        Map a uniform draw onto the integer range [low, high]
+        Works for wei amounts beyond int64, which numpy integers can't draw
+        """
+        if high < low:
+            raise ValueError(f"empty range [{low}, {high}]")
+        return min(high, low + int(u * (high - low + 1)))
     
     def get_eth_balance(self) -> float:
         """Get ETH balance in ether"""
-        balance_wei = self.w3.eth.get_balance(self.address)
+        balance_wei = self._eth.get_balance(self.address)
         return self.w3.from_wei(balance_wei, 'ether')
     
+    def _get_token(self, token_address: str) -> Contract:
+        """Get a cached contract instance for a token"""
+        token_contract = self._token_contract_cache.get(token_address)
+        if token_contract is None:
+            token_contract = get_contract(
+                self.w3, token_address, self.contracts[token_address]['abi']
+            )
+            self._token_contract_cache[token_address] = token_contract
+        return token_contract
+    
     def get_token_balance(self, token_address: str) -> int:
         """Get ERC20 token balance"""
         try:
-            token_contract = self.w3.eth.contract(
-                address=token_address,
-                abi=self.contracts[token_address]['abi']
-            )
-            return token_contract.functions.balanceOf(self.address).call()
+            balance_of = self._balance_of_fns.get(token_address)
+            if balance_of is None:
+                balance_of = self._get_token(token_address).functions.balanceOf
+                self._balance_of_fns[token_address] = balance_of
+            return balance_of(self.address).call()
         except Exception as e:
-            logger.error(f"Failed to get token balance: {e}")
+            logger.error("Failed to get token balance: %s", e)
             return 0
     
+    def _multicall(self, calls: List[Tuple[str, bytes]]) -> List[bytes]:
+        """Execute read-only calls through this agent's Multicall3 (see multicall)"""
+        return multicall(self.w3, self.multicall_address, calls)
+    
+    def _get_erc20_tokens(self) -> List[Tuple[str, str]]:
+        """(name, address) of every ERC20 token the agent tracks"""
+        return [
+            (name, contract_info['address'])
+            for name, contract_info in self.contracts.items()
+            if 'ERC20' in name or name in ['TEST', 'USDC']
+        ]
+    
     def get_all_balances(self) -> Dict[str, float]:
         """Get all token balances for the agent"""
+        if self.multicall_address:
+            try:
+                return self._get_all_balances_multicall()
+            except Exception as e:
+                logger.warning("Multicall balance query failed, falling back: %s", e)
+        
         balances = {
             'ETH': self.get_eth_balance()
         }
         
         # Get ERC20 token balances
-        for name, contract_info in self.contracts.items():
-            if 'ERC20' in name or name in ['TEST', 'USDC']:
-                try:
-                    balance = self.get_token_balance(contract_info['address'])
-                    decimals = self.get_token_decimals(contract_info['address'])
-                    balances[name] = balance / (10 ** decimals)
-                except Exception as e:
-                    logger.warning(f"Failed to get balance for {name}: {e}")
-                    balances[name] = 0.0
+        for name, address in self._get_erc20_tokens():
+            try:
+                balance = self.get_token_balance(address)
+                decimals = self.get_token_decimals(address)
+                balances[name] = balance / (10 ** decimals)
+            except Exception as e:
+                logger.warning("Failed to get balance for %s: %s", name, e)
+                balances[name] = 0.0
+        
+        return balances
+    
+    def _get_all_balances_multicall(self) -> Dict[str, float]:
+        """Fetch ETH and every token balance (plus unknown decimals) in one call"""
+        tokens = self._get_erc20_tokens()
+        owner = self._owner_word
+        
+        calls = [(self.multicall_address, GET_ETH_BALANCE_SEL + owner)]
+        calls += [(address, BALANCE_OF_SEL + owner) for _, address in tokens]
+        missing_decimals = [
+            address for _, address in tokens if address not in self._decimals_cache
+        ]
+        calls += [(address, DECIMALS_SEL) for address in missing_decimals]
+        
+        results = self._multicall(calls)
+        
+        for address, raw in zip(missing_decimals, results[1 + len(tokens):]):
+            self._decimals_cache[address] = decode(['uint8'], raw)[0]
+        
+        balances = {
+            'ETH': self.w3.from_wei(decode(['uint256'], results[0])[0], 'ether')
+        }
+        for (name, address), raw in zip(tokens, results[1:1 + len(tokens)]):
+            balance = decode(['uint256'], raw)[0]
+            balances[name] = balance / (10 ** self._decimals_cache[address])
         
         return balances
     
     def get_token_decimals(self, token_address: str) -> int:
         """Get token decimals"""
+        if token_address in self._decimals_cache:
+            return self._decimals_cache[token_address]
         try:
-            token_contract = self.w3.eth.contract(
-                address=token_address,
-                abi=self.contracts[token_address]['abi']
-            )
-            return token_contract.functions.decimals().call()
+            decimals = self._get_token(token_address).functions.decimals().call()
+            self._decimals_cache[token_address] = decimals
+            return decimals
         except:
             return 18  # Default to 18 decimals
     
-    def send_transaction(self, transaction: Dict[str, Any]) -> str:
+    @property
+    def nonce(self) -> int:
+        """Next nonce of this agent's account"""
+        return self._nonce_state.value
+    
+    @nonce.setter
+    def nonce(self, value: int):
+        self._nonce_state.value = value
+    
+    def share_nonce(self, other: 'AgentBase'):
+        """Draw nonces from another agent on the same account instead of a private counter"""
+        if other.address != self.address:
+            raise ValueError(f"{other.agent_id} signs for a different account")
+        self._nonce_state = other._nonce_state
+    
+    def _reserve_nonces(self, n: int) -> range:
+        """Reserve a contiguous block of nonces for batched submissions"""
+        with self._nonce_state.lock:
+            nonces = range(self.nonce, self.nonce + n)
+            self.nonce += n
+        return nonces
+    
+    def _get_fee_params(self) -> Dict[str, int]:
+        """Fee fields for new transactions, refreshed every FEE_CACHE_TTL seconds"""
+        now = time.monotonic()
+        if now - self._fee_fetched_at >= FEE_CACHE_TTL:
+            block = self._eth.get_block('latest')
+            self.fee_params = fee_params(block, DEFAULT_PRIORITY_FEE, self.gas_price)
+            self._fee_fetched_at = now
+        return self.fee_params
+    
+    def _estimate_gas(self, transaction: Dict[str, Any]) -> int:
         """
-        Send a transaction and wait for confirmation
+        Gas limit for a transaction, estimated once per (target, selector)
+        
+        Args:
+            transaction: Transaction with 'to' and 'data'
+            
+        Returns:
+            Cached estimate with headroom, capped at gas_limit
+        """
+        data = transaction.get('data', b'')
+        if isinstance(data, str):
+            data = Web3.to_bytes(hexstr=data)
+        key = (transaction.get('to'), bytes(data[:4]))
+        
+        if key not in self._gas_cache:
+            try:
+                estimate = self._eth.estimate_gas({
+                    'from': self.address,
+                    'to': transaction.get('to'),
+                    'data': data,
+                    'value': transaction.get('value', 0)
+                })
+                # Arguments vary between calls sharing a selector (e.g. a
+                # transfer to a fresh address writes a new storage slot)
+                self._gas_cache[key] = min(self.gas_limit, estimate * GAS_ESTIMATE_MULTIPLIER)
+            except Exception as e:
+                logger.debug("Gas estimation failed for %s, using gas_limit: %s", key, e)
+                return self.gas_limit
+        
+        return self._gas_cache[key]
+    
+    def _sign_transaction(self, transaction: Dict[str, Any], nonce: int):
+        """Fill in sender, nonce, fees and gas, then sign"""
+        # Replace any fee fields a build_transaction() call may have filled in
+        for key in FEE_FIELDS:
+            transaction.pop(key, None)
+        transaction.update({
+            'from': self.address,
+            'nonce': nonce,
+            'chainId': self.chain_id,
+            **self._get_fee_params()
+        })
+        transaction['gas'] = self._estimate_gas(transaction)
+        return self.account.sign_transaction(transaction)
+    
+    def _confirm_transaction(self, tx_hash: HexBytes) -> str:
+        """Wait for a broadcast transaction to be mined and record its gas"""
+        receipt = self._eth.wait_for_transaction_receipt(
+            tx_hash, timeout=120, poll_latency=self.poll_latency
+        )
+        
+        if receipt.status == 0:
+            raise TransactionFailedError(f"Transaction {Web3.to_hex(tx_hash)} reverted")
+        
+        # A new block was mined, so the cached head is stale
+        self._block_cache = None
+        
+        # Update tracking
+        self.transaction_count += 1
+        self.total_gas_used += receipt.gasUsed
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Agent %s sent transaction %s", self.agent_id, tx_hash.hex())
+        
+        return tx_hash.hex()
+    
+    def broadcast_transaction(self, transaction: Dict[str, Any],
+                              nonce: Optional[int] = None) -> HexBytes:
+        """
+        Sign and broadcast a transaction without waiting for it to be mined
         
         Args:
             transaction: Transaction dictionary
+            nonce: Pre-reserved nonce (see _reserve_nonces); defaults to the next one
             
         Returns:
             Transaction hash
         """
-        try:
-            # Add transaction parameters
-            transaction.update({
-                'from': self.address,
-                'nonce': self.nonce,
-                'gas': self.gas_limit,
-                'gasPrice': self.gas_price,
-                'chainId': self.w3.eth.chain_id
-            })
+        reserved = nonce is not None
+        with self._nonce_state.lock:
+            if not reserved:
+                nonce = self.nonce
             
-            # Sign and send transaction
-            signed_tx = self.account.sign_transaction(transaction)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            signed_tx = self._sign_transaction(transaction, nonce)
+            try:
+                tx_hash = self._eth.send_raw_transaction(signed_tx.rawTransaction)
+            except Exception:
+                if not reserved:
+                    # Rejected before broadcast (e.g. nonce drift), resync once
+                    self.nonce = self._eth.get_transaction_count(self.address, 'pending')
+                raise
             
-            # Wait for confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            # A broadcast transaction consumes its nonce even if it reverts
+            if not reserved:
+                self.nonce += 1
+        return tx_hash
+    
+    def send_transaction(self, transaction: Dict[str, Any], nonce: Optional[int] = None) -> str:
+        """
+        Send a transaction and wait for confirmation
+        
+        Args:
+            transaction: Transaction dictionary
+            nonce: Pre-reserved nonce (see _reserve_nonces); defaults to the next one
             
-            if receipt.status == 0:
-                raise Exception("Transaction failed")
+        Returns:
+            Transaction hash
+        """
+        try:
+            tx_hash = self.broadcast_transaction(transaction, nonce)
+            return self._confirm_transaction(tx_hash)
             
-            # Update tracking
-            self.nonce += 1
-            self.transaction_count += 1
-            self.total_gas_used += receipt.gasUsed
+        except Exception as e:
+            logger.error("Transaction failed for agent %s: %s", self.agent_id, e)
+            raise
+    
+    def send_transactions(self, transactions: List[Dict[str, Any]]) -> List[str]:
+        """
+        Sign several transactions up front and broadcast them in one batch
+        Nonces follow list order, so an approval mines before the call that
+        spends it
+        
+        Args:
+            transactions: Transaction dictionaries, in execution order
             
-            logger.debug(f"Agent {self.agent_id} sent transaction {tx_hash.hex()}")
+        Returns:
+            Transaction hashes, in the same order
+        """
+        if len(transactions) == 1:
+            return [self.send_transaction(transactions[0])]
+        
+        try:
+            with self._nonce_state.lock:
+                nonces = self._reserve_nonces(len(transactions))
+                signed = [
+                    self._sign_transaction(transaction, nonce)
+                    for transaction, nonce in zip(transactions, nonces)
+                ]
+                try:
+                    with batch_requests(self.w3) as batch:
+                        for signed_tx in signed:
+                            batch.add('eth_sendRawTransaction',
+                                      [Web3.to_hex(signed_tx.rawTransaction)], HexBytes)
+                        tx_hashes = batch.execute()
+                except Exception:
+                    # Some of the batch may have been accepted; trust the node
+                    self.nonce = self._eth.get_transaction_count(self.address, 'pending')
+                    raise
             
-            return tx_hash.hex()
+            return [self._confirm_transaction(tx_hash) for tx_hash in tx_hashes]
             
         except Exception as e:
-            logger.error(f"Transaction failed for agent {self.agent_id}: {e}")
+            logger.error("Transaction batch failed for agent %s: %s", self.agent_id, e)
             raise
     
-    def approve_token_spending(self, token_address: str, spender: str, amount: int) -> str:
+    def approve_token_spending(self, token_address: str, spender: str, amount: int,
+                               nonce: Optional[int] = None) -> str:
         """Approve token spending by another contract"""
-        token_contract = self.w3.eth.contract(
-            address=token_address,
-            abi=self.contracts[token_address]['abi']
-        )
+        data = APPROVE_SEL + _enc_addr_uint((spender, amount))
+        transaction = {'to': token_address, 'data': data}
+        return self.send_transaction(transaction, nonce)
+    
+    def _load_allowances(self, pairs: List[Tuple[str, str]]):
+        """Fetch on-chain allowances for uncached (token, spender) pairs in one batch"""
+        missing = [pair for pair in pairs if pair not in self._allowance]
+        if not missing:
+            return
         
-        transaction = token_contract.functions.approve(spender, amount).build_transaction({})
-        return self.send_transaction(transaction)
+        with batch_requests(self.w3) as batch:
+            for token_address, spender in missing:
+                batch.add(
+                    'eth_call',
+                    [{'to': token_address,
+                      'data': '0x' + (ALLOWANCE_SEL + _enc_addr_addr((self.address, spender))).hex()},
+                     'latest'],
+                    lambda raw: int(raw, 16)
+                )
+            for pair, allowance in zip(missing, batch.execute()):
+                self._allowance[pair] = allowance
     
-    def transfer_token(self, token_address: str, to: str, amount: int) -> str:
-        """Transfer tokens to another address"""
-        token_contract = self.w3.eth.contract(
-            address=token_address,
-            abi=self.contracts[token_address]['abi']
-        )
+    def _approval_transaction(self, token_address: str, spender: str,
+                              amount: int) -> Optional[Dict[str, Any]]:
+        """Unsigned max approval if the known allowance is short of amount, else None"""
+        key = (token_address, spender)
+        self._load_allowances([key])
+        if self._allowance[key] >= amount:
+            return None
+        # Approve the maximum once so later calls skip the approval entirely
+        return self.max_approval(token_address, spender)
+    
+    def max_approval(self, token_address: str, spender: str) -> Dict[str, Any]:
+        """Unsigned approve(spender, MAX_UINT256) transaction for a token"""
+        return {'to': token_address, 'data': APPROVE_SEL + _enc_addr_uint((spender, MAX_UINT256))}
+    
+    def record_allowance(self, token_address: str, spender: str, amount: int):
+        """Record an allowance granted outside ensure_allowance (e.g. at setup)"""
+        self._allowance[(token_address, spender)] = amount
+    
+    def ensure_allowance(self, token_address: str, spender: str, amount: int) -> Optional[str]:
+        """
+        Make sure spender may pull amount of token, approving only when needed
         
-        transaction = token_contract.functions.transfer(to, amount).build_transaction({})
-        return self.send_transaction(transaction)
+        Args:
+            token_address: Token to spend
+            spender: Contract that will call transferFrom
+            amount: Amount about to be spent
+            
+        Returns:
+            Approval transaction hash, or None if the allowance already covers amount
+        """
+        transaction = self._approval_transaction(token_address, spender, amount)
+        if transaction is None:
+            return None
+        
+        tx_hash = self.send_transaction(transaction)
+        self._allowance[(token_address, spender)] = MAX_UINT256
+        return tx_hash
     
-    def calculate_pnl(self) -> float:
-        """Calculate profit/loss based on initial and current balances"""
-        current_balances = self.get_all_balances()
-        pnl = 0.0
+    def spend_allowance(self, token_address: str, spender: str, amount: int):
+        """Record that spender consumed up to amount of the cached allowance"""
+        key = (token_address, spender)
+        if key in self._allowance:
+            self._allowance[key] = max(0, self._allowance[key] - amount)
+    
+    def transfer_token(self, token_address: str, to: str, amount: int,
+                       nonce: Optional[int] = None) -> str:
+        """Transfer tokens to another address"""
+        data = TRANSFER_SEL + _enc_addr_uint((to, amount))
+        transaction = {'to': token_address, 'data': data}
+        return self.send_transaction(transaction, nonce)
+    
+    def calculate_pnl(self, current_balances: Dict[str, float] = None) -> float:
+        """
+        Calculate profit/loss based on initial and current balances
         
-        for token, initial_balance in self.initial_balances.items():
-            current_balance = current_balances.get(token, 0.0)
-            # Simplified PnL calculation (assumes 1:1 USD value)
-            pnl += (current_balance - initial_balance)
+        Args:
+            current_balances: Balances from get_all_balances (fetched if omitted)
+            
+        Returns:
+            Sum of balance changes (simplified: assumes 1:1 USD value)
+        """
+        if current_balances is None:
+            current_balances = self.get_all_balances()
         
-        self.pnl = pnl
-        return pnl
+        self.balances = self.token_registry.to_array(current_balances)
+        self.pnl = float((self.balances - self.initial_balances_arr).sum())
+        return self.pnl
+    
+    def get_balance_changes(self) -> Dict[str, float]:
+        """Per-token change since start, as of the last calculate_pnl"""
+        return self.token_registry.to_dict(self.balances - self.initial_balances_arr)
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get agent performance statistics"""
+        current_balances = self.get_all_balances()
         return {
             'agent_id': self.agent_id,
             'address': self.address,
-            'pnl': self.calculate_pnl(),
+            'pnl': self.calculate_pnl(current_balances),
             'total_gas_used': self.total_gas_used,
             'transaction_count': self.transaction_count,
             'avg_gas_per_tx': self.total_gas_used / max(1, self.transaction_count),
-            'current_balances': self.get_all_balances(),
-            'trade_count': len(self.trade_history)
+            'current_balances': current_balances,
+            'trade_count': self._trades_n
         }
     
+    @property
+    def trade_types(self) -> List[str]:
+        """Trade type names, indexed by the ids stored in trade_history"""
+        return list(self._type_interner)
+    
+    @property
+    def trade_history(self) -> np.ndarray:
+        """Retained trades, oldest first, as a structured array (see TRADE_DTYPE)"""
+        order = self._trade_slots()
+        
+        history = np.empty(len(order), dtype=TRADE_DTYPE)
+        for name in TRADE_DTYPE.names:
+            history[name] = self._trades[name][order]
+        return history
+    
+    @property
+    def trade_amounts(self) -> List[Any]:
+        """Amounts of the retained trades, oldest first, exact where float64 rounds them"""
+        exact = self._trades_exact
+        order = self._trade_slots()
+        amounts = self._trades['amount'][order].tolist()
+        if exact:
+            for k, slot in enumerate(order.tolist()):
+                if slot in exact:
+                    amounts[k] = exact[slot]
+        return amounts
+    
+    def _trade_slots(self) -> np.ndarray:
+        """Column indices of the retained trades, oldest first"""
+        n = min(self._trades_n, self._trades_size)
+        start = self._trades_n - n
+        return np.arange(start, start + n) % self._trades_size
+    
+    def _current_block(self) -> Tuple[int, int]:
+        """
+        (block number, timestamp) that per-block reads are memoized against
+        The block seeded for this step, or the chain head if none is seeded
+        """
+        block = self._block_cache
+        if block is None:
+            latest = self._eth.get_block('latest')
+            block = self._block_cache = (latest['number'], latest['timestamp'])
+        return block
+    
+    def resync(self):
+        """Re-read the nonce and drop cached chain state (e.g. after a chain revert)"""
+        self.nonce = self._eth.get_transaction_count(self.address, 'pending')
+        self._block_cache = None
+        self._allowance.clear()
+    
+    def seed_block(self, number: Optional[int], timestamp: Optional[int] = None):
+        """
+        Set the block this step's reads are keyed on (e.g. from the runner's
+        step batch); None makes the next read fetch the chain head
+        """
+        self._block_cache = None if number is None else (number, timestamp)
+    
+    def enqueue_reads(self, calls: List[Tuple[str, bytes]]) -> Optional[Callable[[List[bytes]], None]]:
+        """
+        Append this agent's start-of-step reads to the runner's shared call list
+        
+        Args:
+            calls: (target address, calldata) pairs the runner sends in one
+                Multicall3 eth_call (or one JSON-RPC batch without Multicall3)
+            
+        Returns:
+            Callback receiving the raw return data for this agent's calls, or
+            None if there is nothing to prefetch
+        """
+        return None
+    
     def log_trade(self, trade_type: str, details: Dict[str, Any]):
         """Log a trade for performance tracking"""
-        trade_record = {
-            'timestamp': self.w3.eth.get_block('latest')['timestamp'],
-            'block_number': self.w3.eth.block_number,
-            'agent_id': self.agent_id,
-            'trade_type': trade_type,
-            **details
-        }
-        self.trade_history.append(trade_record)
-        logger.info(f"Agent {self.agent_id} executed {trade_type}: {details}")
+        type_id = self._type_interner.setdefault(trade_type, len(self._type_interner))
+        amount = next((details[key] for key in TRADE_AMOUNT_KEYS if key in details), 0)
+        
+        block_number, timestamp = self._current_block()
+        
+        if self._trades_n == self._trades_size < self._trades_cap:
+            self._grow_trades()
+        i = self._trades_n % self._trades_size
+        self._trades['timestamp'][i] = timestamp
+        self._trades['block_number'][i] = block_number
+        self._trades['trade_type'][i] = type_id
+        self._trades['amount'][i] = amount
+        if isinstance(amount, (int, np.integer)) and float(amount) != amount:
+            self._trades_exact[i] = int(amount)
+        elif self._trades_exact:
+            self._trades_exact.pop(i, None)
+        self._trades_n += 1
+        
+        # The runner's QueueHandler hands the record to its background listener
+        logger.info("Agent %s executed %s: %s", self.agent_id, trade_type, details)
+    
+    def _grow_trades(self):
+        """Double the trade columns (up to capacity); only called before any wrap"""
+        size = min(2 * self._trades_size, self._trades_cap)
+        for name, column in self._trades.items():
+            grown = np.empty(size, dtype=column.dtype)
+            grown[:self._trades_size] = column
+            self._trades[name] = grown
+        self._trades_size = size
+    
+    def act(self, market_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run step() if should_act() says so; returns the step's actions or None"""
+        if self.should_act(market_data):
+            return self.step(market_data)
+        return None
     
     @abstractmethod
     def step(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -5,12 +5,44 @@ Provides liquidity to AMM pools and manages LP positions
 """
 
 import math
-from typing import Dict, Any, Optional
-from .agent_base import AgentBase
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import numpy as np
+from eth_abi import decode
+from eth_utils import function_signature_to_4byte_selector
+from eth_abi.registry import registry as abi_registry
+from .agent_base import (AgentBase, DEFAULT_POLL_LATENCY, BALANCE_OF_SEL, GET_BLOCK_NUMBER_SEL,
+                         MAX_UINT256, TRADE_HISTORY_CAPACITY, get_contract)
+from .rpc import batch_requests, supports_batch
 import logging
 
 logger = logging.getLogger(__name__)
 
+GET_RESERVES_SEL = function_signature_to_4byte_selector('getReserves()')
+ADD_LIQUIDITY_SEL = function_signature_to_4byte_selector(
+    'addLiquidity(uint256,uint256,uint256,uint256,address)'
+)
+REMOVE_LIQUIDITY_SEL = function_signature_to_4byte_selector(
+    'removeLiquidity(uint256,uint256,uint256,address)'
+)
+
+_enc_add_liquidity = abi_registry.get_encoder('(uint256,uint256,uint256,uint256,address)')
+_enc_remove_liquidity = abi_registry.get_encoder('(uint256,uint256,uint256,address)')
+
+# Fractional bits of the fixed-point pool ratio used by should_rebalance
+RATIO_SHIFT = 32
+
+@dataclass
+class PoolState:
+    """Snapshot of the pool and the market maker's holdings"""
+    lp: int
+    reserve_a: int
+    reserve_b: int
+    bal_a: int
+    bal_b: int
+    block_number: int
+
 class MarketMaker(AgentBase):
     """
     Market maker agent that provides liquidity to AMM pools
@@ -32,7 +64,9 @@ class MarketMaker(AgentBase):
                  initial_balance: Dict[str, float] = None,
                  target_ratio: float = 0.5,
                  rebalance_threshold: float = 0.05,
-                 random_seed: Optional[int] = None):
+                 random_seed: Optional[int] = None,
+                 poll_latency: float = DEFAULT_POLL_LATENCY,
+                 trade_history_capacity: int = TRADE_HISTORY_CAPACITY):
         """
         Initialize market maker agent
         
@@ -43,7 +77,8 @@ class MarketMaker(AgentBase):
             target_ratio: Target ratio of token A to total liquidity value
             rebalance_threshold: Threshold for triggering rebalance
         """
-        super().__init__(agent_id, private_key, w3, contracts, initial_balance, random_seed)
+        super().__init__(agent_id, private_key, w3, contracts, initial_balance,
+                         random_seed, poll_latency, trade_history_capacity)
         
         self.amm_address = amm_address
         self.token_a_address = token_a_address
@@ -51,75 +86,168 @@ class MarketMaker(AgentBase):
         self.target_ratio = target_ratio
         self.rebalance_threshold = rebalance_threshold
         
-        # AMM contract instance
-        self.amm_contract = self.w3.eth.contract(
-            address=amm_address,
-            abi=contracts['AMM']['abi']
-        )
-        
-        # Token contracts
-        self.token_a_contract = self.w3.eth.contract(
-            address=token_a_address,
-            abi=contracts[token_a_address]['abi']
-        )
-        
-        self.token_b_contract = self.w3.eth.contract(
-            address=token_b_address,
-            abi=contracts[token_b_address]['abi']
-        )
+        # AMM and token contract instances, shared with other agents
+        self.amm_contract = get_contract(self.w3, amm_address, contracts['AMM']['abi'])
+        self.token_a_contract = get_contract(self.w3, token_a_address,
+                                             contracts[token_a_address]['abi'])
+        self.token_b_contract = get_contract(self.w3, token_b_address,
+                                             contracts[token_b_address]['abi'])
+        
+        # Bound contract functions, resolved from the ABI once
+        self._fn_get_reserves = self.amm_contract.functions.getReserves
+        self._fn_balance_of = self.amm_contract.functions.balanceOf
+        
+        # Calldata for the pool state reads (LP, reserves, token balances);
+        # addresses never change
+        owner = self._owner_word
+        self._state_calls = [
+            (self.amm_address, BALANCE_OF_SEL + owner),
+            (self.amm_address, GET_RESERVES_SEL),
+            (self.token_a_address, BALANCE_OF_SEL + owner),
+            (self.token_b_address, BALANCE_OF_SEL + owner)
+        ]
+        
+        # Reads memoized per block: (block_number, reserve_a, reserve_b) / (block_number, lp)
+        self._reserves_cache: Optional[Tuple[int, int, int]] = None
+        self._lp_cache: Optional[Tuple[int, int]] = None
+        # Start-of-step state batched by the runner, consumed by should_act
+        self._prefetched_state: Optional[PoolState] = None
         
         # LP position tracking
         self.lp_token_balance = 0
         self.initial_reserves = None
         self.fees_collected = 0.0
         self.impermanent_loss = 0.0
+        # IL depends only on the reserve ratio; remember the last one evaluated
+        self._last_reserves: Optional[Tuple[int, int]] = None
+        self._last_il = 0.0
         
         # Strategy parameters
         self.min_liquidity_ratio = 0.1  # Minimum 10% of tokens as liquidity
         self.max_liquidity_ratio = 0.9  # Maximum 90% of tokens as liquidity
         self.fee_collection_threshold = 0.01  # Collect fees when > 1% of position
         
-        logger.info(f"🏦 Market Maker {agent_id} initialized for AMM {amm_address}")
+        # Liquidity sizing constants as small integer fractions, so wei amounts
+        # are scaled exactly (floats lose precision past 2**53) and floored like
+        # the pool's own rounding
+        tr = Fraction(self.target_ratio).limit_denominator(10_000)
+        self._tr_num, self._tr_den = tr.numerator, tr.denominator
+        self._inv_tr_num, self._inv_tr_den = tr.denominator - tr.numerator, tr.numerator
+        self._max_liq_num, self._max_liq_den = round(self.max_liquidity_ratio * 10_000), 10_000
+        
+        # Rebalance band around the target ratio as RATIO_SHIFT-bit fixed point,
+        # so the per-step check is integer-only (strategy parameters are fixed)
+        self._rebalance_lo = round((self.target_ratio - self.rebalance_threshold) * (1 << RATIO_SHIFT))
+        self._rebalance_hi = round((self.target_ratio + self.rebalance_threshold) * (1 << RATIO_SHIFT))
+        
+        logger.info("🏦 Market Maker %s initialized for AMM %s", agent_id, amm_address)
     
     def get_lp_balance(self) -> int:
-        """Get current LP token balance"""
-        try:
-            balance = self.amm_contract.functions.balanceOf(self.address).call()
-            self.lp_token_balance = balance
-            return balance
-        except Exception as e:
-            logger.error(f"Failed to get LP balance: {e}")
-            return 0
+        """Get current LP token balance (RPC errors propagate to the caller)"""
+        block_number, _ = self._current_block()
+        if self._lp_cache is not None and self._lp_cache[0] == block_number:
+            return self._lp_cache[1]
+        balance = self._fn_balance_of(self.address).call()
+        self._lp_cache = (block_number, balance)
+        self.lp_token_balance = balance
+        return balance
     
-    def get_pool_reserves(self) -> tuple:
-        """Get current pool reserves"""
-        try:
-            reserves = self.amm_contract.functions.getReserves().call()
-            return reserves[0], reserves[1]  # (reserve_a, reserve_b)
-        except Exception as e:
-            logger.error(f"Failed to get pool reserves: {e}")
-            return 0, 0
+    def get_pool_reserves(self) -> Tuple[int, int]:
+        """Get current pool reserves (RPC errors propagate to the caller)"""
+        block_number, _ = self._current_block()
+        if self._reserves_cache is not None and self._reserves_cache[0] == block_number:
+            return self._reserves_cache[1:]
+        reserves = self._fn_get_reserves().call()
+        self._reserves_cache = (block_number, reserves[0], reserves[1])
+        return reserves[0], reserves[1]  # (reserve_a, reserve_b)
+    
+    def _fetch_state_batch(self) -> PoolState:
+        """
+        Read LP balance, reserves and token balances in one round trip
+        Uses a JSON-RPC batch, or Multicall3 when the provider can't batch
+        """
+        if not supports_batch(self.w3) and self.multicall_address:
+            *raw, raw_block = self._multicall(
+                self._state_calls + [(self.multicall_address, GET_BLOCK_NUMBER_SEL)]
+            )
+            state = self._decode_state(raw, decode(['uint256'], raw_block)[0])
+        else:
+            address, amm = self.address, self.amm_contract
+            with batch_requests(self.w3) as batch:
+                add_call = batch.add_call
+                add_call(amm, 'balanceOf', address)
+                add_call(amm, 'getReserves')
+                add_call(self.token_a_contract, 'balanceOf', address)
+                add_call(self.token_b_contract, 'balanceOf', address)
+                batch.add('eth_blockNumber', [], lambda raw: int(raw, 16))
+                lp, (reserve_a, reserve_b), bal_a, bal_b, block_number = batch.execute()
+            
+            state = PoolState(lp=lp, reserve_a=reserve_a, reserve_b=reserve_b,
+                              bal_a=bal_a, bal_b=bal_b, block_number=block_number)
+        
+        self._seed_state(state)
+        return state
+    
+    def _seed_state(self, state: PoolState):
+        """Seed the per-block caches so later reads this block are free"""
+        self._reserves_cache = (state.block_number, state.reserve_a, state.reserve_b)
+        self._lp_cache = (state.block_number, state.lp)
+    
+    def _decode_state(self, raw: List[bytes], block_number: int) -> PoolState:
+        """PoolState from the raw return data of _state_calls"""
+        raw_lp, raw_reserves, raw_a, raw_b = raw
+        reserve_a, reserve_b = decode(['uint256', 'uint256'], raw_reserves)
+        return PoolState(
+            lp=decode(['uint256'], raw_lp)[0],
+            reserve_a=reserve_a,
+            reserve_b=reserve_b,
+            bal_a=decode(['uint256'], raw_a)[0],
+            bal_b=decode(['uint256'], raw_b)[0],
+            block_number=block_number
+        )
+    
+    def enqueue_reads(self, calls: List[Tuple[str, bytes]]) -> Callable[[List[bytes]], None]:
+        """Queue the pool state reads so should_act needs no round trip of its own"""
+        calls.extend(self._state_calls)
+        
+        def apply(raw: List[bytes]):
+            # The runner seeds the chain head before applying results
+            state = self._decode_state(raw, self._current_block()[0])
+            self._seed_state(state)
+            self._prefetched_state = state
+        
+        return apply
     
     def calculate_optimal_liquidity_amounts(self, 
                                           available_a: int, 
-                                          available_b: int) -> tuple:
+                                          available_b: int,
+                                          state: Optional[PoolState] = None) -> tuple:
         """
         Calculate optimal amounts to add as liquidity based on current pool ratio
         
         Args:
             available_a: Available amount of token A
             available_b: Available amount of token B
+            state: Pool snapshot to use instead of reading reserves
             
         Returns:
             Tuple of (amount_a, amount_b) to add as liquidity
         """
-        reserve_a, reserve_b = self.get_pool_reserves()
+        if state is not None:
+            reserve_a, reserve_b = state.reserve_a, state.reserve_b
+        else:
+            reserve_a, reserve_b = self.get_pool_reserves()
         
         if reserve_a == 0 or reserve_b == 0:
-            # Initial liquidity provision - use target ratio
-            total_value_a = available_a + (available_b * self.target_ratio / (1 - self.target_ratio))
-            amount_a = int(total_value_a * self.target_ratio * self.max_liquidity_ratio)
-            amount_b = int(amount_a * (1 - self.target_ratio) / self.target_ratio)
+            # Initial liquidity provision - use target ratio. With tr = n/d:
+            # (available_a + available_b * tr / (1 - tr)) * tr * max_liq
+            #   = (available_a * (d - n) + available_b * n) * n * max_liq / ((d - n) * d)
+            amount_a = (
+                (available_a * self._inv_tr_num + available_b * self._tr_num)
+                * self._tr_num * self._max_liq_num
+                // (self._inv_tr_num * self._tr_den * self._max_liq_den)
+            )
+            amount_b = amount_a * self._inv_tr_num // self._inv_tr_den
             
             # Ensure we don't exceed available amounts
             amount_a = min(amount_a, available_a)
@@ -127,48 +255,65 @@ class MarketMaker(AgentBase):
             
             return amount_a, amount_b
         
-        # Calculate optimal amounts based on current pool ratio
-        pool_ratio = reserve_a / reserve_b if reserve_b > 0 else 1
+        # Match the current pool ratio, reduced so the cross-products stay small
+        g = math.gcd(reserve_a, reserve_b)
+        ratio_a, ratio_b = reserve_a // g, reserve_b // g
         
         # Try using all of token A first
-        amount_a = int(available_a * self.max_liquidity_ratio)
-        required_b = int(amount_a / pool_ratio)
+        amount_a = available_a * self._max_liq_num // self._max_liq_den
+        required_b = amount_a * ratio_b // ratio_a
         
         if required_b <= available_b:
             return amount_a, required_b
         
         # Use all of token B and calculate required A
-        amount_b = int(available_b * self.max_liquidity_ratio)
-        required_a = int(amount_b * pool_ratio)
+        amount_b = available_b * self._max_liq_num // self._max_liq_den
+        required_a = amount_b * ratio_a // ratio_b
         
         if required_a <= available_a:
             return required_a, amount_b
         
-        # Scale down proportionally
-        scale_factor = min(available_a / required_a, available_b / required_b)
-        return int(required_a * scale_factor), int(required_b * scale_factor)
+        # Scale down proportionally by the tighter of available/required
+        if available_a * required_b <= available_b * required_a:
+            scale_num, scale_den = available_a, required_a
+        else:
+            scale_num, scale_den = available_b, required_b
+        return required_a * scale_num // scale_den, required_b * scale_num // scale_den
     
     def add_liquidity(self, amount_a: int, amount_b: int) -> Optional[str]:
         """Add liquidity to the AMM pool"""
         try:
-            # Approve token spending
-            self.approve_token_spending(self.token_a_address, self.amm_address, amount_a)
-            self.approve_token_spending(self.token_b_address, self.amm_address, amount_b)
+            # Approve token spending only if the remaining allowance is short
+            self._load_allowances([
+                (self.token_a_address, self.amm_address),
+                (self.token_b_address, self.amm_address)
+            ])
+            approvals = []
+            for token_address, amount in ((self.token_a_address, amount_a),
+                                          (self.token_b_address, amount_b)):
+                approval = self._approval_transaction(token_address, self.amm_address, amount)
+                if approval is not None:
+                    approvals.append((token_address, approval))
             
             # Calculate minimum amounts (5% slippage tolerance)
             amount_a_min = int(amount_a * 0.95)
             amount_b_min = int(amount_b * 0.95)
             
-            # Add liquidity
-            transaction = self.amm_contract.functions.addLiquidity(
-                amount_a,
-                amount_b,
-                amount_a_min,
-                amount_b_min,
-                self.address
-            ).build_transaction({})
+            # Add liquidity; calldata is encoded directly so no build_transaction() RPCs
+            transaction = {
+                'to': self.amm_address,
+                'data': ADD_LIQUIDITY_SEL + _enc_add_liquidity(
+                    (amount_a, amount_b, amount_a_min, amount_b_min, self.address)
+                )
+            }
             
-            tx_hash = self.send_transaction(transaction)
+            # Approvals and the deposit are signed together and sent in one batch
+            tx_hashes = self.send_transactions([tx for _, tx in approvals] + [transaction])
+            tx_hash = tx_hashes[-1]
+            for token_address, _ in approvals:
+                self._allowance[(token_address, self.amm_address)] = MAX_UINT256
+            self.spend_allowance(self.token_a_address, self.amm_address, amount_a)
+            self.spend_allowance(self.token_b_address, self.amm_address, amount_b)
             
             # Log the trade
             self.log_trade('ADD_LIQUIDITY', {
@@ -184,18 +329,18 @@ class MarketMaker(AgentBase):
             return tx_hash
             
         except Exception as e:
-            logger.error(f"Failed to add liquidity: {e}")
+            logger.error("Failed to add liquidity: %s", e)
             return None
     
     def remove_liquidity(self, lp_amount: int, min_amount_a: int = 0, min_amount_b: int = 0) -> Optional[str]:
         """Remove liquidity from the AMM pool"""
         try:
-            transaction = self.amm_contract.functions.removeLiquidity(
-                lp_amount,
-                min_amount_a,
-                min_amount_b,
-                self.address
-            ).build_transaction({})
+            transaction = {
+                'to': self.amm_address,
+                'data': REMOVE_LIQUIDITY_SEL + _enc_remove_liquidity(
+                    (lp_amount, min_amount_a, min_amount_b, self.address)
+                )
+            }
             
             tx_hash = self.send_transaction(transaction)
             
@@ -207,69 +352,87 @@ class MarketMaker(AgentBase):
             return tx_hash
             
         except Exception as e:
-            logger.error(f"Failed to remove liquidity: {e}")
+            logger.error("Failed to remove liquidity: %s", e)
             return None
     
-    def calculate_impermanent_loss(self) -> float:
-        """Calculate current impermanent loss"""
+    def calculate_impermanent_loss(self, reserves: Optional[Tuple[int, int]] = None) -> float:
+        """
+        Calculate current impermanent loss
+        
+        Args:
+            reserves: Current (reserve_a, reserve_b); read from the pool if omitted
+            
+        Returns:
+            Impermanent loss as a fraction (<= 0)
+        """
         if self.initial_reserves is None:
             return 0.0
         
         initial_a, initial_b = self.initial_reserves
-        current_a, current_b = self.get_pool_reserves()
+        current_a, current_b = reserves if reserves is not None else self.get_pool_reserves()
         
         if initial_a == 0 or initial_b == 0 or current_a == 0 or current_b == 0:
             return 0.0
         
-        # Calculate price ratios
-        initial_ratio = initial_a / initial_b
-        current_ratio = current_a / current_b
-        
-        if initial_ratio == 0:
-            return 0.0
-        
-        # Simplified impermanent loss calculation
-        ratio_change = current_ratio / initial_ratio
-        
-        # IL = 2 * sqrt(ratio_change) / (1 + ratio_change) - 1
-        il = 2 * math.sqrt(ratio_change) / (1 + ratio_change) - 1
-        
+        # Same price ratio as last time (exact integer compare), same IL
+        if self._last_reserves is not None:
+            prev_a, prev_b = self._last_reserves
+            if current_a * prev_b == prev_a * current_b:
+                self.impermanent_loss = self._last_il
+                return self._last_il
+        
+        # With r = (current_a / current_b) / (initial_a / initial_b) = num / den,
+        # IL = 2 * sqrt(r) / (1 + r) - 1 = 2 * sqrt(num * den) / (num + den) - 1,
+        # evaluated on exact integer cross-products instead of float ratios
+        num = current_a * initial_b
+        den = initial_a * current_b
+        il = 2.0 * math.isqrt(num * den) / (num + den) - 1.0
+        
+        self._last_reserves = (current_a, current_b)
+        self._last_il = il
         self.impermanent_loss = il
         return il
     
-    def should_rebalance(self, market_data: Dict[str, Any]) -> bool:
+    def should_rebalance(self, market_data: Dict[str, Any],
+                         state: Optional[PoolState] = None) -> bool:
         """Determine if position should be rebalanced"""
-        current_a, current_b = self.get_pool_reserves()
+        if state is not None:
+            current_a, current_b = state.reserve_a, state.reserve_b
+        else:
+            current_a, current_b = self.get_pool_reserves()
         
         if current_a == 0 or current_b == 0:
             return False
         
-        # Calculate current ratio
+        # Calculate current ratio in fixed point; exact for any reserve size
         total_value = current_a + current_b  # Simplified value calculation
-        current_ratio = current_a / total_value
-        
-        # Check if deviation exceeds threshold
-        ratio_deviation = abs(current_ratio - self.target_ratio)
+        current_ratio = (current_a << RATIO_SHIFT) // total_value
         
-        return ratio_deviation > self.rebalance_threshold
+        # |ratio - target| > threshold, against bounds precomputed at init
+        return current_ratio < self._rebalance_lo or current_ratio > self._rebalance_hi
     
     def should_act(self, market_data: Dict[str, Any]) -> bool:
         """Determine if market maker should act"""
-        # Check if we have liquidity to provide
-        balance_a = self.get_token_balance(self.token_a_address)
-        balance_b = self.get_token_balance(self.token_b_address)
+        # Check if we have liquidity to provide; one failure point for all reads
+        state, self._prefetched_state = self._prefetched_state, None
+        try:
+            if state is None:
+                state = self._fetch_state_batch()
+        except Exception as e:
+            logger.error("Market maker %s state read failed: %s", self.agent_id, e)
+            return False
+        self.lp_token_balance = state.lp
         
         # Act if we have tokens but no LP position
-        lp_balance = self.get_lp_balance()
-        if lp_balance == 0 and (balance_a > 0 or balance_b > 0):
+        if state.lp == 0 and (state.bal_a > 0 or state.bal_b > 0):
             return True
         
         # Act if rebalancing is needed
-        if self.should_rebalance(market_data):
+        if self.should_rebalance(market_data, state):
             return True
         
         # Act randomly with low probability to simulate market making activity
-        return self.random.random() < 0.1  # 10% chance per step
+        return self.next_uniform() < 0.1  # 10% chance per step
     
     def step(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute one step of market making strategy"""
@@ -280,13 +443,19 @@ class MarketMaker(AgentBase):
         }
         
         try:
-            balance_a = self.get_token_balance(self.token_a_address)
-            balance_b = self.get_token_balance(self.token_b_address)
-            lp_balance = self.get_lp_balance()
+            # Reserves may have moved since should_act, start the step fresh
+            self._reserves_cache = None
+            self._lp_cache = None
+            
+            state = self._fetch_state_batch()
+            balance_a, balance_b = state.bal_a, state.bal_b
+            lp_balance = self.lp_token_balance = state.lp
             
             # If no LP position and we have tokens, add initial liquidity
             if lp_balance == 0 and (balance_a > 0 or balance_b > 0):
-                amount_a, amount_b = self.calculate_optimal_liquidity_amounts(balance_a, balance_b)
+                amount_a, amount_b = self.calculate_optimal_liquidity_amounts(
+                    balance_a, balance_b, state
+                )
                 
                 if amount_a > 0 and amount_b > 0:
                     tx_hash = self.add_liquidity(amount_a, amount_b)
@@ -299,7 +468,7 @@ class MarketMaker(AgentBase):
                         })
             
             # Check for rebalancing opportunities
-            elif self.should_rebalance(market_data):
+            elif self.should_rebalance(market_data, state):
                 # Simple rebalancing: remove some liquidity and re-add in correct ratio
                 rebalance_amount = int(lp_balance * 0.1)  # Rebalance 10% of position
                 
@@ -316,8 +485,10 @@ class MarketMaker(AgentBase):
                         # Wait a bit and re-add optimally (simplified)
                         # In practice, this would be done in the next step
             
-            # Calculate and update performance metrics
-            self.calculate_impermanent_loss()
+            # Calculate and update performance metrics; reserves moved if we traded
+            self.calculate_impermanent_loss(
+                None if actions['actions_taken'] else (state.reserve_a, state.reserve_b)
+            )
             
             actions['performance'] = {
                 'lp_balance': lp_balance,
@@ -326,7 +497,115 @@ class MarketMaker(AgentBase):
             }
             
         except Exception as e:
-            logger.error(f"Market maker {self.agent_id} step failed: {e}")
+            logger.error("Market maker %s step failed: %s", self.agent_id, e)
             actions['error'] = str(e)
         
-        return actions
\ No newline at end of file
+        return actions
+
+
+class MarketMakerFleet:
+    """
+    Structure-of-arrays view over many market makers on the same pool
+    Sizing and impermanent-loss math runs once per fleet with NumPy ufuncs;
+    only transaction submission stays per agent. SimulationRunner doesn't use
+    it: each market maker sizes its deposit with exact integer math on the
+    reserves it reads right before sending
+    """
+    
+    def __init__(self, agents: List[MarketMaker]):
+        """
+        Initialize fleet
+        
+        Args:
+            agents: Market makers sharing one AMM pool
+        """
+        self.agents = agents
+        n = len(agents)
+        self.target_ratio = np.fromiter((a.target_ratio for a in agents), np.float64, n)
+        self.max_liquidity_ratio = np.fromiter((a.max_liquidity_ratio for a in agents), np.float64, n)
+        self.balance_a = np.zeros(n)
+        self.balance_b = np.zeros(n)
+        self.lp_balance = np.zeros(n)
+        self.initial_reserve_a = np.zeros(n)
+        self.initial_reserve_b = np.zeros(n)
+        # Approximate (float64) IL per agent; each agent keeps its own exact value
+        self.impermanent_loss = np.zeros(n)
+        self.sync_from_agents()
+    
+    def __len__(self) -> int:
+        return len(self.agents)
+    
+    def sync_from_agents(self):
+        """Pull LP balances and initial reserves tracked by each agent"""
+        for i, agent in enumerate(self.agents):
+            self.lp_balance[i] = agent.lp_token_balance
+            self.initial_reserve_a[i], self.initial_reserve_b[i] = agent.initial_reserves or (0, 0)
+    
+    def update_balances(self, balance_a: np.ndarray, balance_b: np.ndarray):
+        """Set every agent's token balances (wei, as float64)"""
+        self.balance_a[:] = balance_a
+        self.balance_b[:] = balance_b
+    
+    def calculate_optimal_liquidity_amounts(self, reserve_a: float,
+                                            reserve_b: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized MarketMaker.calculate_optimal_liquidity_amounts
+        
+        Args:
+            reserve_a: Current pool reserve of token A
+            reserve_b: Current pool reserve of token B
+            
+        Returns:
+            Arrays of (amount_a, amount_b) per agent; cast to int before sending
+        """
+        available_a, available_b = self.balance_a, self.balance_b
+        
+        if reserve_a == 0 or reserve_b == 0:
+            # Initial liquidity provision - use target ratio
+            tr = self.target_ratio
+            total_value_a = available_a + available_b * tr / (1 - tr)
+            amount_a = np.floor(total_value_a * tr * self.max_liquidity_ratio)
+            amount_b = np.floor(amount_a * (1 - tr) / tr)
+            return np.minimum(amount_a, available_a), np.minimum(amount_b, available_b)
+        
+        pool_ratio = reserve_a / reserve_b
+        
+        # Try using all of token A first, else all of token B
+        use_a = np.floor(available_a * self.max_liquidity_ratio)
+        required_b = np.floor(use_a / pool_ratio)
+        use_b = np.floor(available_b * self.max_liquidity_ratio)
+        required_a = np.floor(use_b * pool_ratio)
+        
+        a_fits = required_b <= available_b
+        b_fits = required_a <= available_a
+        
+        # Scale down proportionally when neither side fits
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scale = np.minimum(available_a / required_a, available_b / required_b)
+        
+        amount_a = np.where(a_fits, use_a, np.where(b_fits, required_a, np.floor(required_a * scale)))
+        amount_b = np.where(a_fits, required_b, np.where(b_fits, use_b, np.floor(required_b * scale)))
+        return amount_a, amount_b
+    
+    def calculate_impermanent_loss(self, cur_a: float, cur_b: float) -> np.ndarray:
+        """
+        Impermanent loss for every agent, stored in self.impermanent_loss
+        Agents' own impermanent_loss (exact integer math) is left untouched
+        
+        Args:
+            cur_a: Current pool reserve of token A
+            cur_b: Current pool reserve of token B
+            
+        Returns:
+            Array of impermanent loss fractions (0 where no position is tracked)
+        """
+        valid = (self.initial_reserve_a > 0) & (self.initial_reserve_b > 0)
+        if cur_a == 0 or cur_b == 0:
+            valid[:] = False
+        
+        # t = (cur_a / cur_b) / (initial_a / initial_b) from cross-products
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (cur_a * self.initial_reserve_b) / (self.initial_reserve_a * cur_b)
+            self.impermanent_loss[:] = np.where(valid, 2 * np.sqrt(t) / (1 + t) - 1, 0.0)
+        
+        return self.impermanent_loss
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+JSON-RPC Helpers for Blockchain Simulation
+Shares one pooled HTTP connection per node and batches read-only calls
+into a single HTTP round trip
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from eth_abi.registry import registry as abi_registry
+from eth_utils import function_abi_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+from web3 import Web3, HTTPProvider
+from web3._utils.abi import map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3._utils.request import make_post_request
+
+logger = logging.getLogger(__name__)
+
+# Connection pool sizing for the shared session
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 256
+REQUEST_TIMEOUT = 30
+
+# Idle pooled connections sit between simulation steps; TCP keepalive stops
+# NATs and proxies from silently dropping them
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+]
+
+# Shared pool for CPU-bound transaction signing, so async callers don't block
+# their event loop (signing releases the GIL when coincurve is installed)
+SIGN_POOL_WORKERS = 4
+SIGN_POOL = ThreadPoolExecutor(max_workers=SIGN_POOL_WORKERS, thread_name_prefix='signer')
+
+# Methods that change node state; a batch holding one is never re-sent as
+# single calls, since the node may already have applied it
+WRITE_METHODS = frozenset({'eth_sendRawTransaction', 'eth_sendTransaction'})
+
+_web3_instances: Dict[str, Web3] = {}
+_web3_lock = threading.Lock()
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets have TCP keepalive enabled"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', KEEPALIVE_SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def make_session(pool_connections: int = POOL_CONNECTIONS,
+                 pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+    """Create a keep-alive session with a large connection pool"""
+    session = requests.Session()
+    adapter = KeepAliveAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=3, backoff_factor=0.1)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # requests sends this by default; pin it so nodes never close after a reply
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+class PooledHTTPProvider(HTTPProvider):
+    """
+    HTTPProvider bound to one explicit session
+    web3.py caches injected sessions per thread, so requests made from
+    worker threads would otherwise open their own connections
+    """
+
+    def __init__(self, endpoint_uri: str, session: requests.Session = None,
+                 request_kwargs: Dict[str, Any] = None):
+        super().__init__(endpoint_uri, request_kwargs=request_kwargs)
+        self.session = session or make_session()
+
+    def post(self, data: bytes) -> bytes:
+        """POST a raw JSON-RPC payload through the pooled session"""
+        response = self.session.post(self.endpoint_uri, data=data, **self.get_request_kwargs())
+        response.raise_for_status()
+        return response.content
+
+    def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        return self.decode_rpc_response(self.post(request_data))
+
+
+def make_web3(url: str, session: requests.Session = None) -> Web3:
+    """Create a Web3 instance backed by a pooled HTTP session"""
+    provider = PooledHTTPProvider(
+        url,
+        session=session,
+        request_kwargs={'timeout': REQUEST_TIMEOUT}
+    )
+    return Web3(provider)
+
+
+def get_web3(url: str) -> Web3:
+    """
+    Get the process-wide Web3 instance for a node URL
+    Deployer, runner and agents share it so they reuse one connection pool
+    """
+    with _web3_lock:
+        if url not in _web3_instances:
+            _web3_instances[url] = make_web3(url)
+        return _web3_instances[url]
+
+
+def fee_params(block: Dict[str, Any], priority_fee: int, legacy_gas_price: int) -> Dict[str, int]:
+    """
+    Fee fields for new transactions given the latest block
+
+    Args:
+        block: Latest block; EIP-1559 chains report baseFeePerGas
+        priority_fee: Tip per gas for type-2 transactions (wei)
+        legacy_gas_price: gasPrice used on pre-London chains (wei)
+
+    Returns:
+        Type-2 fee fields, or a legacy gasPrice when the chain has no base fee
+    """
+    base_fee = block.get('baseFeePerGas')
+    if base_fee is None:
+        return {'gasPrice': legacy_gas_price}
+    return {
+        'type': 2,
+        'maxPriorityFeePerGas': priority_fee,
+        # Headroom for the base fee doubling before inclusion
+        'maxFeePerGas': 2 * base_fee + priority_fee
+    }
+
+
+async def sign_transaction_async(account, transaction: Dict[str, Any]):
+    """Sign a transaction on the shared signer pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(SIGN_POOL, account.sign_transaction, transaction)
+
+
+def _encode_no_args(args: tuple) -> bytes:
+    return b''
+
+
+@functools.lru_cache(maxsize=256)
+def _call_codec(contract, fn_name: str) -> Tuple[bytes, Callable[[tuple], bytes], List[str]]:
+    """
+    (selector, argument encoder, output types) of a contract function
+    Contracts are shared per address/ABI, so resolving the ABI entry once per
+    function spares every batched call the lookup encodeABI() repeats
+    """
+    fn_abi = contract.get_function_by_name(fn_name).abi
+    input_types = [collapse_if_tuple(arg) for arg in fn_abi['inputs']]
+    output_types = [collapse_if_tuple(output) for output in fn_abi['outputs']]
+    # eth_abi has no zero-sized tuple type
+    encoder = abi_registry.get_encoder(f"({','.join(input_types)})") if input_types else _encode_no_args
+    return function_abi_to_4byte_selector(fn_abi), encoder, output_types
+
+
+class RPCBatch:
+    """
+    Collects JSON-RPC requests and sends them as one batch array
+    Mirrors the web3.py v7 ``batch_requests()`` API so callers can move to
+    it unchanged once the pinned web3 version supports it
+    """
+
+    def __init__(self, w3: Web3):
+        """
+        Initialize batch
+
+        Args:
+            w3: Web3 instance whose provider receives the batch
+        """
+        self.w3 = w3
+        self._requests: List[Tuple[str, list]] = []
+        self._decoders: List[Optional[Callable[[Any], Any]]] = []
+
+    def __enter__(self) -> 'RPCBatch':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._requests.clear()
+        self._decoders.clear()
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def add(self, method: str, params: list, decoder: Callable[[Any], Any] = None):
+        """Queue a raw JSON-RPC request with an optional result decoder"""
+        self._requests.append((method, params))
+        self._decoders.append(decoder)
+
+    def add_call(self, contract, fn_name: str, *args, block_identifier: str = 'latest'):
+        """
+        Queue a read-only contract call
+
+        Args:
+            contract: Deployed contract instance
+            fn_name: Contract function name
+            args: Function arguments
+            block_identifier: Block to execute the call against
+        """
+        selector, encoder, output_types = _call_codec(contract, fn_name)
+        data = Web3.to_hex(selector + encoder(args))
+
+        def decode(raw: str) -> Any:
+            decoded = self.w3.codec.decode(output_types, Web3.to_bytes(hexstr=raw))
+            normalized = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, decoded)
+            # Match ContractFunction.call(): single outputs are unwrapped
+            return normalized[0] if len(normalized) == 1 else list(normalized)
+
+        self.add(
+            'eth_call',
+            [{'to': contract.address, 'data': data}, block_identifier],
+            decode
+        )
+
+    def add_balance(self, address: str, block_identifier: str = 'latest'):
+        """Queue an ETH balance lookup (result in wei)"""
+        self.add('eth_getBalance', [address, block_identifier], lambda raw: int(raw, 16))
+
+    def execute(self) -> List[Any]:
+        """
+        Send all queued requests
+
+        Returns:
+            Decoded results in the order the requests were queued
+        """
+        if not self._requests:
+            return []
+
+        responses = self._send_batch()
+        if responses is None:
+            # Provider can't take a batch array, fall back to one call each
+            responses = [
+                self.w3.provider.make_request(method, params)
+                for method, params in self._requests
+            ]
+
+        results = []
+        for (method, _), decoder, response in zip(self._requests, self._decoders, responses):
+            if 'error' in response:
+                raise ValueError(f"{method} failed: {response['error']}")
+            result = response['result']
+            results.append(decoder(result) if decoder else result)
+
+        return results
+
+    def _send_batch(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        POST the queued requests as one JSON-RPC array
+
+        Returns:
+            Responses in request order, or None if the node doesn't take
+            batches and every request is safe to send again one at a time
+
+        Raises:
+            requests.RequestException: Transport failure; the node may have
+                processed the batch, so it is not re-sent
+            ValueError: Batch holding a transaction was rejected
+        """
+        if not supports_batch(self.w3):
+            return None
+        provider = self.w3.provider
+
+        payload = [
+            {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}
+            for request_id, (method, params) in enumerate(self._requests)
+        ]
+
+        data = json.dumps(payload).encode()
+        if isinstance(provider, PooledHTTPProvider):
+            raw_response = provider.post(data)
+        else:
+            raw_response = make_post_request(
+                provider.endpoint_uri, data, **provider.get_request_kwargs()
+            )
+
+        try:
+            responses = json.loads(raw_response)
+        except ValueError:
+            responses = None
+
+        # Nodes without batch support answer with a single error object
+        if not isinstance(responses, list) or len(responses) != len(payload):
+            if any(method in WRITE_METHODS for method, _ in self._requests):
+                raise ValueError(f"Node rejected a batch of {len(payload)} requests "
+                                 f"holding transactions: {str(responses)[:200]}")
+            logger.debug("Node doesn't take batch requests, falling back to single calls")
+            return None
+
+        # The spec allows responses in any order
+        return sorted(responses, key=lambda response: response['id'])
+
+
+def supports_batch(w3: Web3) -> bool:
+    """Whether the provider can send JSON-RPC batch arrays"""
+    return isinstance(w3.provider, HTTPProvider)
+
+
+def batch_requests(w3: Web3) -> RPCBatch:
+    """Create a JSON-RPC batch bound to a Web3 instance"""
+    return RPCBatch(w3)
+
+
+def wait_for_receipts(w3: Web3, tx_hashes: List[Any], timeout: float = 120,
+                      poll_latency: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Wait for many broadcast transactions, polling all receipts in one batch
+
+    Args:
+        w3: Web3 instance
+        tx_hashes: Transaction hashes (bytes or hex strings)
+        timeout: Seconds to wait for the slowest transaction
+        poll_latency: Seconds between polls
+
+    Returns:
+        Raw receipts in the order of tx_hashes
+    """
+    hex_hashes = [Web3.to_hex(tx_hash) for tx_hash in tx_hashes]
+    receipts: List[Optional[Dict[str, Any]]] = [None] * len(hex_hashes)
+    deadline = time.monotonic() + timeout
+
+    while True:
+        pending = [i for i, receipt in enumerate(receipts) if receipt is None]
+        if not pending:
+            return receipts
+
+        with batch_requests(w3) as batch:
+            for i in pending:
+                batch.add('eth_getTransactionReceipt', [hex_hashes[i]])
+            for i, receipt in zip(pending, batch.execute()):
+                receipts[i] = receipt
+
+        if any(receipt is None for receipt in receipts):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"{len(pending)} transactions not mined after {timeout}s")
+            time.sleep(poll_latency)
@@ -3,31 +3,90 @@
 Simulation Runner - Orchestrates all agents and runs the simulation
 """
 
+import atexit
 import json
+import queue
 import time
 import logging
+import logging.handlers
+from collections import deque
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+import numpy as np
+import orjson
+from eth_abi import decode
+from hexbytes import HexBytes
+from web3.exceptions import BlockNotFound
 import pandas as pd
-from web3 import Web3
+import pyarrow as pa
+import pyarrow.parquet as pq
 import click
 
-from .agent_base import AgentBase
+from .agent_base import (AgentBase, GET_BLOCK_NUMBER_SEL, GET_BLOCK_TIMESTAMP_SEL, MAX_UINT256,
+                         TRADE_HISTORY_CAPACITY, TRANSFER_SEL, _enc_addr_uint, get_account, get_contract,
+                         multicall)
 from .market_maker import MarketMaker
-from .trader import RandomTrader, MomentumTrader, ArbitrageTrader
+from .trader import (Trader, RandomTrader, MomentumTrader, MomentumSignal, ArbitrageTrader,
+                     TRADE_STATS_DTYPE)
 from .metrics import MetricsCalculator
+from .rpc import batch_requests, get_web3, wait_for_receipts
+
+# Setup logging; records are formatted by the QueueHandler and written by a
+# background listener, so log calls never wait on file or terminal I/O
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.FileHandler('simulation.log'),
+    logging.StreamHandler()
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
-# Setup logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('simulation.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+# Step results in the report summary, and the default (and minimum) number
+# kept in memory; the full history is streamed to an NDJSON file
+RECENT_STEP_RESULTS = 10
+STEP_LOG_BUFFER_SIZE = 1 << 20
+# Step results decoded at a time when writing the Parquet tables
+STEP_RESULTS_CHUNK = 1000
+
+# Default Ganache accounts (first 10 accounts)
+DEFAULT_PRIVATE_KEYS = [
+    "0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d",
+    "0x6cbed15c793ce57650b9877cf6fa156fbef513c4e6134f022a85b1ffdd59b2a1",
+    "0x6370fd033278c143179d81c5526140625662b8daa446c22ee2d73db3707e620c",
+    "0x646f1ce2fdad0e6deeeb5c7e8e5543bdde65e86029e2fd9fc169899c440a7913",
+    "0xadd53f9a7e588d003326d1cbf9e4a43c061aadd9bc938c843a79e7b4fd2ad743",
+    "0x395df67f0c2d2d9fe1ad08d1bc8b6627011959b79c53d7dd6a3536a33ab8a4fd",
+    "0xe485d098507f54e7733a205420dfddbe58db035fa577fc294ebd14db90767a52",
+    "0xa453611d9419d0e56f499079478fd72c37b251a94bfde4d19872c44cf65386e3",
+    "0x829e924fdf021ba3dbbc4225edfece9aca04b929d6e75613329ca6f1d31c0bb4",
+    "0xb0057716d5917badaf911b193b12b910811c1497b5bada8d7711f758981c3773"
+]
+
+# Agents built concurrently by _setup_agents
+AGENT_SETUP_WORKERS = 8
+
+# Ganache snapshot taken after the initial token distribution (see reuse_snapshot)
+SNAPSHOT_FILE = '.ganache_snapshot.json'
+
+# orjson options for results; NumPy values are serialized natively
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the non-JSON types results may hold (Decimal ETH balances)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 class SimulationRunner:
     """
     Main simulation orchestrator
@@ -49,15 +108,33 @@ class SimulationRunner:
         self.config = config
         self.ganache_url = ganache_url
         
-        # Initialize Web3 connection
-        self.w3 = Web3(Web3.HTTPProvider(ganache_url))
+        # Initialize Web3 connection (shared with agents and the deployer)
+        self.w3 = get_web3(ganache_url)
         if not self.w3.is_connected():
             raise Exception(f"Cannot connect to Ganache at {ganache_url}")
+        # Fixed for the node, so setup transactions are built without asking again
+        self.chain_id = self.w3.eth.chain_id
         
         # Load deployed contracts
         self.contracts = self._load_contracts(deployed_contracts_file)
         
-        # Initialize agents
+        # Multicall3 aggregator for the per-step reads (older deployments lack it)
+        self.multicall_address = self.contracts.get('Multicall3', {}).get('address')
+        
+        # Token contracts for the initial distribution
+        self.test_token = get_contract(self.w3, self.contracts['ERC20Token']['address'],
+                                       self.contracts['ERC20Token']['abi'])
+        self.usdc_token = get_contract(self.w3, self.contracts['USDC']['address'],
+                                       self.contracts['USDC']['abi'])
+        
+        # Initialize agents; config 'type' -> builder taking the shared
+        # constructor kwargs and the agent's own config
+        self._agent_factories: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], AgentBase]] = {
+            'market_maker': self._build_market_maker,
+            'random_trader': self._build_random_trader,
+            'momentum_trader': self._build_momentum_trader,
+            'arbitrage_trader': self._build_arbitrage_trader
+        }
         self.agents: List[AgentBase] = []
         self._setup_agents()
         
@@ -68,32 +145,58 @@ class SimulationRunner:
         self.current_step = 0
         self.max_steps = config.get('max_steps', 100)
         self.step_delay = config.get('step_delay', 1.0)  # Seconds between steps
+        # Run agents concurrently within a step (agents then see each other's
+        # transactions in nondeterministic order)
+        self.concurrent_agents = config.get('concurrent_agents', False)
+        # Revert to the post-distribution Ganache snapshot of an earlier run
+        # instead of re-sending the transfers (rewinds everything after it)
+        self.reuse_snapshot = config.get('reuse_snapshot', False)
+        # Agent calls are I/O-bound, so one thread per agent overlaps their RPCs
+        self._agent_pool = ThreadPoolExecutor(
+            max_workers=max(1, len(self.agents)), thread_name_prefix='agent'
+        ) if self.concurrent_agents else None
         
         # Results storage
-        self.step_results = []
+        self.max_steps_in_memory = max(
+            RECENT_STEP_RESULTS, config.get('max_steps_in_memory', RECENT_STEP_RESULTS)
+        )
+        self.step_results = deque(maxlen=self.max_steps_in_memory)  # Recent steps only
+        self.step_results_file = f"step_results_{int(time.time())}.ndjson"
+        self._step_log = None  # Open for the duration of run_simulation()
         self.agent_performance = {}
         
-        logger.info(f"🎮 Simulation initialized with {len(self.agents)} agents")
+        logger.info("🎮 Simulation initialized with %s agents", len(self.agents))
+    
+    def __enter__(self) -> 'SimulationRunner':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Shut down the agent pool; later steps run their agents in turn"""
+        if self._agent_pool is not None:
+            self._agent_pool.shutdown(wait=True)
+            self._agent_pool = None
     
     def _load_contracts(self, contracts_file: str) -> Dict[str, Any]:
         """Load deployed contract information"""
         try:
-            with open(contracts_file, 'r') as f:
-                deployment_info = json.load(f)
+            deployment_info = orjson.loads(Path(contracts_file).read_bytes())
             
             contracts = {}
             for name, contract_info in deployment_info['contracts'].items():
-                contracts[name] = {
-                    'address': contract_info['address'],
-                    'abi': contract_info['abi']
-                }
-                # Also index by address for easy lookup
-                contracts[contract_info['address']] = {
+                entry = {
                     'address': contract_info['address'],
                     'abi': contract_info['abi']
                 }
+                if 'decimals' in contract_info:
+                    entry['decimals'] = contract_info['decimals']
+                contracts[name] = entry
+                # Also index by address for easy lookup (same entry, not a copy)
+                contracts[contract_info['address']] = entry
             
-            logger.info(f"📄 Loaded {len(contracts)} deployed contracts")
+            logger.info("📄 Loaded %s deployed contracts", len(deployment_info['contracts']))
             return contracts
             
         except FileNotFoundError:
@@ -103,210 +206,340 @@ class SimulationRunner:
     
     def _setup_agents(self):
         """Initialize all simulation agents"""
-        # Default Ganache accounts (first 10 accounts)
-        default_keys = [
-            "0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d",
-            "0x6cbed15c793ce57650b9877cf6fa156fbef513c4e6134f022a85b1ffdd59b2a1",
-            "0x6370fd033278c143179d81c5526140625662b8daa446c22ee2d73db3707e620c",
-            "0x646f1ce2fdad0e6deeeb5c7e8e5543bdde65e86029e2fd9fc169899c440a7913",
-            "0xadd53f9a7e588d003326d1cbf9e4a43c061aadd9bc938c843a79e7b4fd2ad743",
-            "0x395df67f0c2d2d9fe1ad08d1bc8b6627011959b79c53d7dd6a3536a33ab8a4fd",
-            "0xe485d098507f54e7733a205420dfddbe58db035fa577fc294ebd14db90767a52",
-            "0xa453611d9419d0e56f499079478fd72c37b251a94bfde4d19872c44cf65386e3",
-            "0x829e924fdf021ba3dbbc4225edfece9aca04b929d6e75613329ca6f1d31c0bb4",
-            "0xb0057716d5917badaf911b193b12b910811c1497b5bada8d7711f758981c3773"
-        ]
-        
-        # Get contract addresses
-        amm_address = self.contracts['AMM']['address']
-        token_a_address = self.contracts['ERC20Token']['address']  # TEST token
-        token_b_address = self.contracts['USDC']['address']  # USDC token
-        
         agent_configs = self.config.get('agents', [])
         
-        for i, agent_config in enumerate(agent_configs):
-            agent_type = agent_config['type']
-            agent_id = f"{agent_type}_{i}"
-            private_key = default_keys[i % len(default_keys)]
-            
-            # Determine initial balances
-            initial_balance = agent_config.get('initial_balance', {})
-            
-            # Create agent based on type
-            if agent_type == 'market_maker':
-                agent = MarketMaker(
-                    agent_id=agent_id,
-                    private_key=private_key,
-                    w3=self.w3,
-                    contracts=self.contracts,
-                    amm_address=amm_address,
-                    token_a_address=token_a_address,
-                    token_b_address=token_b_address,
-                    initial_balance=initial_balance,
-                    random_seed=self.config.get('random_seed', 42) + i
-                )
-                
-            elif agent_type == 'random_trader':
-                agent = RandomTrader(
-                    agent_id=agent_id,
-                    private_key=private_key,
-                    w3=self.w3,
-                    contracts=self.contracts,
-                    amm_address=amm_address,
-                    token_a_address=token_a_address,
-                    token_b_address=token_b_address,
-                    initial_balance=initial_balance,
-                    trade_frequency=agent_config.get('trade_frequency', 0.1),
-                    random_seed=self.config.get('random_seed', 42) + i
-                )
-                
-            elif agent_type == 'momentum_trader':
-                agent = MomentumTrader(
-                    agent_id=agent_id,
-                    private_key=private_key,
-                    w3=self.w3,
-                    contracts=self.contracts,
-                    amm_address=amm_address,
-                    token_a_address=token_a_address,
-                    token_b_address=token_b_address,
-                    initial_balance=initial_balance,
-                    lookback_periods=agent_config.get('lookback_periods', 5),
-                    momentum_threshold=agent_config.get('momentum_threshold', 0.02),
-                    random_seed=self.config.get('random_seed', 42) + i
-                )
-                
-            elif agent_type == 'arbitrage_trader':
-                agent = ArbitrageTrader(
-                    agent_id=agent_id,
-                    private_key=private_key,
-                    w3=self.w3,
-                    contracts=self.contracts,
-                    amm_address=amm_address,
-                    token_a_address=token_a_address,
-                    token_b_address=token_b_address,
-                    initial_balance=initial_balance,
-                    min_profit_threshold=agent_config.get('min_profit_threshold', 0.01),
-                    random_seed=self.config.get('random_seed', 42) + i
-                )
-                
-            else:
-                logger.warning(f"Unknown agent type: {agent_type}")
-                continue
-            
-            self.agents.append(agent)
-            logger.info(f"✅ Created agent {agent_id} of type {agent_type}")
-    
-    def _distribute_initial_tokens(self):
-        """Distribute initial tokens to agents"""
-        logger.info("💰 Distributing initial tokens to agents...")
+        # Each agent reads its nonce and chain state on construction; build
+        # them concurrently, keeping config order
+        with ThreadPoolExecutor(max_workers=AGENT_SETUP_WORKERS) as executor:
+            agents = executor.map(self._make_agent, range(len(agent_configs)), agent_configs)
+            self.agents = [agent for agent in agents if agent is not None]
+        
+        # Agents beyond the key list reuse accounts; give each account one
+        # nonce sequence so their transactions (possibly concurrent) don't collide
+        by_address: Dict[str, AgentBase] = {}
+        for agent in self.agents:
+            first = by_address.setdefault(agent.address, agent)
+            if first is not agent:
+                agent.share_nonce(first)
+        
+        self.agents_by_pool: Dict[str, List[AgentBase]] = {}
+        for agent in self.agents:
+            self.agents_by_pool.setdefault(agent.amm_address, []).append(agent)
         
-        # Get token contracts
-        test_token = self.w3.eth.contract(
-            address=self.contracts['ERC20Token']['address'],
-            abi=self.contracts['ERC20Token']['abi']
+        # Trade counters for every agent in one table (rows of non-traders stay 0)
+        self.agent_stats = np.zeros(len(self.agents), dtype=TRADE_STATS_DTYPE)
+        for i, agent in enumerate(self.agents):
+            if isinstance(agent, Trader):
+                agent.bind_stats(self.agent_stats, i)
+        
+        # Momentum traders share one price history, updated once per step
+        self.momentum_signal = MomentumSignal(
+            [agent for agent in self.agents if isinstance(agent, MomentumTrader)]
         )
+    
+    def _make_agent(self, i: int, agent_config: Dict[str, Any]) -> Optional[AgentBase]:
+        """Create the i-th agent from its config, or None for an unknown type"""
+        agent_type = agent_config['type']
+        factory = self._agent_factories.get(agent_type)
+        if factory is None:
+            logger.warning("Unknown agent type: %s", agent_type)
+            return None
+        
+        agent_id = f"{agent_type}_{i}"
+        common = {
+            'agent_id': agent_id,
+            'private_key': DEFAULT_PRIVATE_KEYS[i % len(DEFAULT_PRIVATE_KEYS)],
+            'w3': self.w3,
+            'contracts': self.contracts,
+            'amm_address': self.contracts['AMM']['address'],
+            'token_a_address': self.contracts['ERC20Token']['address'],  # TEST token
+            'token_b_address': self.contracts['USDC']['address'],  # USDC token
+            'initial_balance': agent_config.get('initial_balance', {}),
+            'random_seed': self.config.get('random_seed', 42) + i,
+            'trade_history_capacity': self.config.get('trade_history_capacity', TRADE_HISTORY_CAPACITY)
+        }
+        agent = factory(common, agent_config)
         
-        usdc_token = self.w3.eth.contract(
-            address=self.contracts['USDC']['address'],
-            abi=self.contracts['USDC']['abi']
+        logger.info("✅ Created agent %s of type %s", agent_id, agent_type)
+        return agent
+    
+    def _build_market_maker(self, common: Dict[str, Any], agent_config: Dict[str, Any]) -> MarketMaker:
+        """Market maker on the TEST/USDC pool"""
+        return MarketMaker(**common)
+    
+    def _build_random_trader(self, common: Dict[str, Any], agent_config: Dict[str, Any]) -> RandomTrader:
+        """Random trader with its configured trade frequency"""
+        return RandomTrader(
+            **common,
+            trade_frequency=agent_config.get('trade_frequency', 0.1)
+        )
+    
+    def _build_momentum_trader(self, common: Dict[str, Any],
+                               agent_config: Dict[str, Any]) -> MomentumTrader:
+        """Momentum trader with its configured lookback and threshold"""
+        return MomentumTrader(
+            **common,
+            lookback_periods=agent_config.get('lookback_periods', 5),
+            momentum_threshold=agent_config.get('momentum_threshold', 0.02)
+        )
+    
+    def _build_arbitrage_trader(self, common: Dict[str, Any],
+                                agent_config: Dict[str, Any]) -> ArbitrageTrader:
+        """Arbitrage trader with its configured profit threshold"""
+        return ArbitrageTrader(
+            **common,
+            min_profit_threshold=agent_config.get('min_profit_threshold', 0.01)
         )
+    
+    def _distribute_initial_tokens(self):
+        """Distribute initial tokens to agents and pre-approve their AMM"""
+        logger.info("💰 Distributing initial tokens to agents...")
         
         # Deployer account (has all initial tokens)
         deployer_key = "0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d"
-        deployer_account = self.w3.eth.account.from_key(deployer_key)
+        deployer_account = get_account(deployer_key)
+        
+        # Broadcast every transfer back to back with locally assigned nonces,
+        # then wait for all of them together
+        nonce = self.w3.eth.get_transaction_count(deployer_account.address, 'pending')
+        gas_price = self.w3.to_wei(20, 'gwei')
+        test_amount = self.w3.to_wei(10000, 'ether')  # 10,000 TEST tokens
+        usdc_amount = self.w3.to_wei(10000, 'mwei')   # 10,000 USDC (6 decimals)
+        transfers = (('TEST', self.test_token.address, test_amount, 'ether'),
+                     ('USDC', self.usdc_token.address, usdc_amount, 'mwei'))
+        sign = deployer_account.sign_transaction
+        send_raw = self.w3.eth.send_raw_transaction
+        sent = []
         
         for agent in self.agents:
-            # Transfer TEST tokens
-            test_amount = self.w3.to_wei(10000, 'ether')  # 10,000 TEST tokens
-            usdc_amount = self.w3.to_wei(10000, 'mwei')   # 10,000 USDC (6 decimals)
-            
-            # Transfer TEST tokens
-            try:
-                tx = test_token.functions.transfer(agent.address, test_amount).build_transaction({
-                    'from': deployer_account.address,
-                    'nonce': self.w3.eth.get_transaction_count(deployer_account.address),
-                    'gas': 100000,
-                    'gasPrice': self.w3.to_wei('20', 'gwei')
-                })
-                
-                signed_tx = deployer_account.sign_transaction(tx)
-                tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-                self.w3.eth.wait_for_transaction_receipt(tx_hash)
-                
-                logger.debug(f"Transferred {self.w3.from_wei(test_amount, 'ether')} TEST to {agent.agent_id}")
-                
-            except Exception as e:
-                logger.error(f"Failed to transfer TEST tokens to {agent.agent_id}: {e}")
-            
-            # Transfer USDC tokens
-            try:
-                tx = usdc_token.functions.transfer(agent.address, usdc_amount).build_transaction({
-                    'from': deployer_account.address,
-                    'nonce': self.w3.eth.get_transaction_count(deployer_account.address),
-                    'gas': 100000,
-                    'gasPrice': self.w3.to_wei('20', 'gwei')
-                })
-                
-                signed_tx = deployer_account.sign_transaction(tx)
-                tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-                self.w3.eth.wait_for_transaction_receipt(tx_hash)
-                
-                logger.debug(f"Transferred {self.w3.from_wei(usdc_amount, 'mwei')} USDC to {agent.agent_id}")
-                
-            except Exception as e:
-                logger.error(f"Failed to transfer USDC tokens to {agent.agent_id}: {e}")
+            agent_address = agent.address
+            for symbol, token_address, amount, unit in transfers:
+                try:
+                    # Calldata is encoded directly; build_transaction() would
+                    # re-resolve the ABI function for every transfer
+                    tx = {
+                        'to': token_address,
+                        'data': TRANSFER_SEL + _enc_addr_uint((agent_address, amount)),
+                        'value': 0,
+                        'nonce': nonce,
+                        'gas': 100000,
+                        'gasPrice': gas_price,
+                        'chainId': self.chain_id
+                    }
+                    
+                    tx_hash = send_raw(sign(tx).rawTransaction)
+                    nonce += 1
+                    sent.append((tx_hash, symbol, amount, unit, agent))
+                    
+                except Exception as e:
+                    logger.error("Failed to transfer %s tokens to %s: %s", symbol, agent.agent_id, e)
+        
+        # Agents signing with the deployer key read their nonce before the
+        # transfers above; continue from the last nonce the transfers used
+        for agent in self.agents:
+            if agent.address == deployer_account.address:
+                agent.nonce = nonce
+        
+        # Each agent approves its AMM for both tokens once, so trades never
+        # need an approval transaction of their own
+        approvals = []
+        for agent in self.agents:
+            for token_address in (self.test_token.address, self.usdc_token.address):
+                try:
+                    tx_hash = agent.broadcast_transaction(
+                        agent.max_approval(token_address, agent.amm_address)
+                    )
+                    approvals.append((tx_hash, token_address, agent))
+                except Exception as e:
+                    logger.error("Failed to pre-approve %s for %s: %s", token_address, agent.agent_id, e)
+        
+        try:
+            receipts = wait_for_receipts(
+                self.w3, [tx_hash for tx_hash, *_ in sent] + [tx_hash for tx_hash, *_ in approvals]
+            )
+        except Exception as e:
+            logger.error("Failed to confirm initial token transfers: %s", e)
+            return
+        
+        for (_, symbol, amount, unit, agent), receipt in zip(sent, receipts):
+            if int(receipt['status'], 16) != 1:
+                logger.error("Failed to transfer %s tokens to %s: transaction reverted",
+                             symbol, agent.agent_id)
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Transferred %s %s to %s",
+                             self.w3.from_wei(amount, unit), symbol, agent.agent_id)
+        
+        for (_, token_address, agent), receipt in zip(approvals, receipts[len(sent):]):
+            if int(receipt['status'], 16) == 1:
+                agent.record_allowance(token_address, agent.amm_address, MAX_UINT256)
+            else:
+                logger.error("Failed to pre-approve %s for %s: transaction reverted",
+                             token_address, agent.agent_id)
+    
+    def _snapshot_key(self) -> Dict[str, Any]:
+        """What a saved snapshot must match to be reused"""
+        return {
+            'ganache_url': self.ganache_url,
+            'contracts': sorted(info['address'] for info in self.contracts.values()),
+            'agents': [agent.address for agent in self.agents]
+        }
     
-    def _advance_blockchain(self):
-        """Advance blockchain by mining a block"""
+    def _take_snapshot(self):
+        """Snapshot the chain and record the snapshot id for later runs"""
         try:
-            # Mine a new block (Ganache auto-mines, but we can still advance time)
-            current_timestamp = self.w3.eth.get_block('latest')['timestamp']
-            
-            # In a real scenario, you might use ganache-cli with --blockTime option
-            # or web3.eth.send_transaction with a dummy transaction to advance blocks
-            
+            snapshot_id = self.w3.provider.make_request('evm_snapshot', [])['result']
+            latest = self.w3.eth.get_block('latest')
+            Path(SNAPSHOT_FILE).write_bytes(orjson.dumps({
+                **self._snapshot_key(),
+                'snapshot_id': snapshot_id,
+                'block_number': latest['number'],
+                'block_hash': latest['hash'].hex()
+            }))
+        except Exception as e:
+            logger.warning("Failed to snapshot chain state: %s", e)
+    
+    def _revert_to_snapshot(self) -> bool:
+        """
+        Revert to the saved post-distribution snapshot, if it belongs to this setup
+        
+        Returns:
+            True if the chain was reverted and agents were resynced
+        """
+        try:
+            saved = orjson.loads(Path(SNAPSHOT_FILE).read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return False
+        if {key: saved.get(key) for key in self._snapshot_key()} != self._snapshot_key():
+            return False
+        
+        # Check the snapshot block belongs to this chain before rewinding to it;
+        # a revert can't be undone if it turns out not to
+        try:
+            block_hash = self.w3.eth.get_block(saved['block_number'])['hash'].hex()
+        except (KeyError, BlockNotFound):
+            block_hash = None  # Older snapshot file, or this chain is shorter
+        if block_hash != saved['block_hash']:
+            logger.warning("Snapshot %s is from another chain, redistributing", saved.get('snapshot_id'))
+            return False
+        
+        try:
+            reverted = self.w3.provider.make_request('evm_revert', [saved['snapshot_id']])['result']
+        except Exception as e:
+            logger.warning("Failed to revert to snapshot: %s", e)
+            return False
+        if not reverted:
+            return False
+        
+        # Ganache consumes a snapshot on revert; take a fresh one for the next run
+        self._take_snapshot()
+        
+        # Nonces and cached chain state were read before the rewind
+        for agent in self.agents:
+            agent.resync()
+        
+        logger.info("⏪ Reverted to snapshot %s, skipping token distribution", saved['snapshot_id'])
+        return True
+    
+    def _advance_blockchain(self) -> Dict[str, Any]:
+        """
+        Advance blockchain by mining a block
+        
+        Returns:
+            Latest block header, shared with the step result
+        """
+        # Ganache auto-mines each transaction; evm_mine closes the step with
+        # its own block without waiting on any block time
+        try:
+            self.w3.provider.make_request('evm_mine', [])
+        except Exception as e:
+            logger.debug("Failed to advance blockchain: %s", e)
+        return self.w3.eth.get_block('latest')
+    
+    def _prefetch_step_reads(self):
+        """
+        Fetch the chain head and every agent's start-of-step reads in one
+        Multicall3 eth_call (one JSON-RPC batch without Multicall3); agents
+        fall back to their own reads if this fails
+        """
+        calls: List[Tuple[str, bytes]] = []
+        pending = []
+        for agent in self.agents:
+            start = len(calls)
+            apply = agent.enqueue_reads(calls)
+            if apply is not None:
+                pending.append((apply, start, len(calls)))
+        
+        try:
+            if self.multicall_address:
+                head = [(self.multicall_address, GET_BLOCK_NUMBER_SEL),
+                        (self.multicall_address, GET_BLOCK_TIMESTAMP_SEL)]
+                raw_number, raw_timestamp, *results = multicall(
+                    self.w3, self.multicall_address, head + calls
+                )
+                number = decode(['uint256'], raw_number)[0]
+                timestamp = decode(['uint256'], raw_timestamp)[0]
+            else:
+                with batch_requests(self.w3) as batch:
+                    batch.add('eth_getBlockByNumber', ['latest', False])
+                    for target, data in calls:
+                        batch.add('eth_call', [{'to': target, 'data': '0x' + data.hex()}, 'latest'],
+                                  HexBytes)
+                    block, *results = batch.execute()
+                number, timestamp = int(block['number'], 16), int(block['timestamp'], 16)
         except Exception as e:
-            logger.debug(f"Failed to advance blockchain: {e}")
+            logger.debug("Step prefetch failed, agents will read individually: %s", e)
+            # Don't let last step's block key this step's reads
+            for agent in self.agents:
+                agent.seed_block(None)
+            return
+        
+        for agent in self.agents:
+            agent.seed_block(number, timestamp)
+        for apply, start, end in pending:
+            apply(results[start:end])
     
     def run_step(self) -> Dict[str, Any]:
         """Execute one simulation step"""
         step_start_time = time.time()
+        agents, step_no = self.agents, self.current_step
+        
+        logger.info("🔄 Executing step %d", step_no)
         
-        logger.info(f"🔄 Executing step {self.current_step}")
+        # One round trip for the reads every agent makes before acting
+        self._prefetch_step_reads()
         
         # Collect market data
         market_data = self.metrics_calculator.get_current_market_state()
         
-        # Execute agent actions
-        agent_actions = []
-        for agent in self.agents:
+        if len(self.momentum_signal):
             try:
-                if agent.should_act(market_data):
-                    actions = agent.step(market_data)
-                    agent_actions.append(actions)
-                    
+                self.momentum_signal.update(self.momentum_signal.traders[0].get_pool_price())
             except Exception as e:
-                logger.error(f"Agent {agent.agent_id} failed in step {self.current_step}: {e}")
+                logger.error("Momentum signal update failed: %s", e)
+        
+        # Execute agent actions
+        if self._agent_pool is not None:
+            agent_actions = self._run_agents_concurrently(market_data)
+        else:
+            agent_actions = self._run_agents_sequentially(market_data)
         
         # Advance blockchain
-        self._advance_blockchain()
+        latest_block = self._advance_blockchain()
         
         # Calculate step metrics
         step_metrics = self.metrics_calculator.calculate_step_metrics(
-            self.current_step,
+            step_no,
             agent_actions,
             market_data
         )
         
         # Collect agent performance data
-        agent_performance = {}
-        for agent in self.agents:
-            agent_performance[agent.agent_id] = agent.get_performance_stats()
+        agent_performance = {agent.agent_id: agent.get_performance_stats() for agent in agents}
         
         step_result = {
-            'step': self.current_step,
+            'step': step_no,
             'timestamp': int(time.time()),
-            'block_number': self.w3.eth.block_number,
+            'block_number': latest_block['number'],
             'execution_time': time.time() - step_start_time,
             'market_data': market_data,
             'agent_actions': agent_actions,
@@ -314,42 +547,119 @@ class SimulationRunner:
             'agent_performance': agent_performance
         }
         
-        self.step_results.append(step_result)
+        self._record_step_result(step_result)
         
-        logger.info(f"✅ Step {self.current_step} completed in {step_result['execution_time']:.2f}s")
+        logger.info("✅ Step %d completed in %.2fs", step_no, step_result['execution_time'])
         
         return step_result
     
+    def _record_step_result(self, step_result: Dict[str, Any]):
+        """Append a step result to the NDJSON log and the in-memory window"""
+        line = orjson.dumps(step_result, default=_json_default, option=ORJSON_OPTIONS) + b'\n'
+        if self._step_log is not None:
+            self._step_log.write(line)
+        else:
+            # Step run outside run_simulation(); don't leave a file open
+            with open(self.step_results_file, 'ab') as f:
+                f.write(line)
+        
+        self.step_results.append(step_result)
+    
+    def _iter_step_results(self) -> Iterator[Dict[str, Any]]:
+        """Stream every step result logged during the run, one line at a time"""
+        if not Path(self.step_results_file).exists():
+            yield from self.step_results
+            return
+        if self._step_log is not None:
+            self._step_log.flush()
+        with open(self.step_results_file, 'rb') as f:
+            for line in f:
+                yield orjson.loads(line)
+    
+    def _iter_step_result_chunks(self) -> Iterator[List[Dict[str, Any]]]:
+        """Logged step results in lists of at most STEP_RESULTS_CHUNK"""
+        chunk = []
+        for step_result in self._iter_step_results():
+            chunk.append(step_result)
+            if len(chunk) == STEP_RESULTS_CHUNK:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def _run_agents_sequentially(self, market_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Let each agent act in turn; returns the actions of those that did"""
+        agent_actions = []
+        for agent in self.agents:
+            try:
+                actions = agent.act(market_data)
+                if actions is not None:
+                    agent_actions.append(actions)
+                    
+            except Exception as e:
+                logger.error("Agent %s failed in step %s: %s", agent.agent_id, self.current_step, e)
+        return agent_actions
+    
+    def _run_agents_concurrently(self, market_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Let every agent act at once on the agent pool so their RPC round trips overlap"""
+        futures = [self._agent_pool.submit(agent.act, market_data) for agent in self.agents]
+        
+        agent_actions = []
+        for agent, future in zip(self.agents, futures):
+            try:
+                actions = future.result()
+                if actions is not None:
+                    agent_actions.append(actions)
+            except Exception as e:
+                logger.error("Agent %s failed in step %s: %s", agent.agent_id, self.current_step, e)
+        return agent_actions
+    
     def run_simulation(self) -> Dict[str, Any]:
         """Run the complete simulation"""
-        logger.info(f"🚀 Starting simulation with {self.max_steps} steps")
+        logger.info("🚀 Starting simulation with %s steps", self.max_steps)
         
         start_time = time.time()
         
-        # Distribute initial tokens
-        self._distribute_initial_tokens()
-        
-        # Run simulation steps
+        # Distribute initial tokens, or rewind to a chain that already has them
+        if not (self.reuse_snapshot and self._revert_to_snapshot()):
+            self._distribute_initial_tokens()
+            if self.reuse_snapshot:
+                self._take_snapshot()
+        
+        # Run simulation steps, one every step_delay seconds: each step's own
+        # execution time counts toward the delay
+        deadline = time.monotonic()
+        # Buffered step log, closed (and so flushed) however the loop ends
+        self._step_log = open(self.step_results_file, 'ab', buffering=STEP_LOG_BUFFER_SIZE)
         try:
             for step in range(self.max_steps):
                 self.current_step = step
+                deadline += self.step_delay
                 
                 # Execute step
                 step_result = self.run_step()
                 
-                # Sleep between steps if configured
-                if self.step_delay > 0:
-                    time.sleep(self.step_delay)
+                # Sleep out the rest of the interval; an overrunning step
+                # resets the schedule instead of making later steps catch up
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                else:
+                    deadline -= remaining
                 
                 # Log progress
                 if step % 10 == 0:
-                    logger.info(f"📊 Progress: {step}/{self.max_steps} steps completed")
+                    logger.info("📊 Progress: %d/%d steps completed", step, self.max_steps)
         
         except KeyboardInterrupt:
             logger.info("🛑 Simulation interrupted by user")
         except Exception as e:
-            logger.error(f"❌ Simulation failed: {e}")
+            logger.error("❌ Simulation failed: %s", e)
             raise
+        finally:
+            self._step_log.close()
+            self._step_log = None
+            self.close()
         
         # Calculate final metrics and generate report
         simulation_results = self._generate_final_report(start_time)
@@ -362,26 +672,39 @@ class SimulationRunner:
         """Generate final simulation report"""
         total_time = time.time() - start_time
         
-        # Calculate overall metrics
-        overall_metrics = self.metrics_calculator.calculate_overall_metrics(self.step_results)
+        # Calculate overall metrics over the full history, streamed from the log
+        overall_metrics = self.metrics_calculator.calculate_overall_metrics(
+            self._iter_step_results()
+        )
         
-        # Collect final agent performance
+        # Collect final agent performance and totals in one pass; agents may
+        # track different token sets, so PnL is aggregated as a vector
         final_agent_performance = {}
-        for agent in self.agents:
+        total_transactions = total_gas_used = 0
+        agent_pnl = np.empty(len(self.agents), dtype=np.float64)
+        for i, agent in enumerate(self.agents):
             final_agent_performance[agent.agent_id] = agent.get_performance_stats()
+            total_transactions += agent.transaction_count
+            total_gas_used += agent.total_gas_used
+            agent_pnl[i] = agent.pnl
         
+        stats = self.agent_stats
         simulation_results = {
             'simulation_config': self.config,
             'execution_summary': {
                 'total_steps': self.current_step + 1,
                 'total_time': total_time,
                 'avg_step_time': total_time / max(1, self.current_step + 1),
-                'total_transactions': sum(agent.transaction_count for agent in self.agents),
-                'total_gas_used': sum(agent.total_gas_used for agent in self.agents)
+                'total_transactions': total_transactions,
+                'total_gas_used': total_gas_used,
+                'total_pnl': float(agent_pnl.sum()),
+                'successful_trades': int(stats['succ'].sum()),
+                'failed_trades': int(stats['fail'].sum()),
+                'total_volume': float(stats['vol'].sum())
             },
             'overall_metrics': overall_metrics,
             'final_agent_performance': final_agent_performance,
-            'step_results': self.step_results[-10:]  # Last 10 steps for summary
+            'step_results': list(self.step_results)[-RECENT_STEP_RESULTS:]  # Last 10 steps for summary
         }
         
         # Save detailed results
@@ -395,52 +718,82 @@ class SimulationRunner:
         
         # Save JSON results
         results_file = f"simulation_results_{timestamp}.json"
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        with open(results_file, 'wb') as f:
+            f.write(orjson.dumps(results, default=_json_default,
+                                 option=ORJSON_OPTIONS | orjson.OPT_INDENT_2))
         
-        logger.info(f"📄 Results saved to {results_file}")
+        logger.info("📄 Results saved to %s", results_file)
         
-        # Save CSV metrics
-        self._save_csv_metrics(timestamp)
+        # Save tabular metrics
+        self._save_metrics_tables(timestamp)
+    
+    @staticmethod
+    def _record_columns(records: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """Column-oriented view of records; keys in first-seen order, missing values None"""
+        keys = dict.fromkeys(key for record in records for key in record)
+        return {key: [record.get(key) for record in records] for key in keys}
+    
+    @staticmethod
+    def _write_table(writers: Dict[str, pq.ParquetWriter], path: str, df: pd.DataFrame):
+        """Append a DataFrame to a Parquet file as one row group, opening it on first use"""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        writer = writers.get(path)
+        if writer is None:
+            writers[path] = pq.ParquetWriter(path, table.schema, compression='zstd')
+            writers[path].write_table(table)
+        else:
+            # Later chunks follow the schema of the first
+            writer.write_table(table.select(writer.schema.names).cast(writer.schema))
     
-    def _save_csv_metrics(self, timestamp: int):
-        """Save metrics to CSV files"""
+    def _save_metrics_tables(self, timestamp: int):
+        """
+        Save metrics as zstd-compressed Parquet, reading the step log a chunk
+        at a time and building each chunk's DataFrame from columns
+        """
+        steps_file = f"step_metrics_{timestamp}.parquet"
+        agents_file = f"agent_performance_{timestamp}.parquet"
+        writers: Dict[str, pq.ParquetWriter] = {}
         try:
-            # Step metrics
-            step_data = []
-            for step_result in self.step_results:
-                row = {
-                    'step': step_result['step'],
-                    'timestamp': step_result['timestamp'],
-                    'block_number': step_result['block_number'],
-                    **step_result['step_metrics']
+            for step_results in self._iter_step_result_chunks():
+                # Step metrics
+                n_steps = len(step_results)
+                columns = {
+                    key: np.fromiter((step_result[key] for step_result in step_results),
+                                     dtype=np.int64, count=n_steps)
+                    for key in ('step', 'timestamp', 'block_number')
                 }
-                step_data.append(row)
-            
-            if step_data:
-                df_steps = pd.DataFrame(step_data)
-                df_steps.to_csv(f"step_metrics_{timestamp}.csv", index=False)
-                logger.info(f"📊 Step metrics saved to step_metrics_{timestamp}.csv")
-            
-            # Agent performance
-            agent_data = []
-            for step_result in self.step_results:
-                for agent_id, performance in step_result['agent_performance'].items():
-                    row = {
-                        'step': step_result['step'],
-                        'timestamp': step_result['timestamp'],
-                        'agent_id': agent_id,
-                        **performance
+                columns.update(self._record_columns(
+                    [step_result['step_metrics'] for step_result in step_results]
+                ))
+                self._write_table(writers, steps_file, pd.DataFrame(columns))
+                
+                # Agent performance
+                agent_rows = [
+                    (step_result['step'], step_result['timestamp'], agent_id, performance)
+                    for step_result in step_results
+                    for agent_id, performance in step_result['agent_performance'].items()
+                ]
+                
+                if agent_rows:
+                    steps, timestamps, agent_ids, performances = zip(*agent_rows)
+                    columns = {
+                        'step': np.array(steps, dtype=np.int64),
+                        'timestamp': np.array(timestamps, dtype=np.int64),
+                        'agent_id': list(agent_ids)
                     }
-                    agent_data.append(row)
+                    columns.update(self._record_columns(performances))
+                    self._write_table(writers, agents_file, pd.DataFrame(columns))
             
-            if agent_data:
-                df_agents = pd.DataFrame(agent_data)
-                df_agents.to_csv(f"agent_performance_{timestamp}.csv", index=False)
-                logger.info(f"📊 Agent performance saved to agent_performance_{timestamp}.csv")
+            if steps_file in writers:
+                logger.info("📊 Step metrics saved to %s", steps_file)
+            if agents_file in writers:
+                logger.info("📊 Agent performance saved to %s", agents_file)
                 
         except Exception as e:
-            logger.error(f"Failed to save CSV metrics: {e}")
+            logger.error("Failed to save metrics tables: %s", e)
+        finally:
+            for writer in writers.values():
+                writer.close()
 
 
 # CLI Interface
@@ -455,8 +808,7 @@ def main(config: str, ganache_url: str, contracts: str, steps: int, delay: float
     
     # Load configuration
     try:
-        with open(config, 'r') as f:
-            simulation_config = json.load(f)
+        simulation_config = orjson.loads(Path(config).read_bytes())
     except FileNotFoundError:
         # Use default configuration
         simulation_config = {
@@ -486,7 +838,7 @@ def main(config: str, ganache_url: str, contracts: str, steps: int, delay: float
         with open(config, 'w') as f:
             json.dump(simulation_config, f, indent=2)
         
-        logger.info(f"📄 Created default configuration: {config}")
+        logger.info("📄 Created default configuration: %s", config)
     
     # Override configuration with CLI arguments
     if steps is not None:
@@ -496,8 +848,8 @@ def main(config: str, ganache_url: str, contracts: str, steps: int, delay: float
     
     # Run simulation
     try:
-        runner = SimulationRunner(simulation_config, ganache_url, contracts)
-        results = runner.run_simulation()
+        with SimulationRunner(simulation_config, ganache_url, contracts) as runner:
+            results = runner.run_simulation()
         
         print("\n🎉 Simulation Summary:")
         print(f"   Total Steps: {results['execution_summary']['total_steps']}")
@@ -510,7 +862,7 @@ def main(config: str, ganache_url: str, contracts: str, steps: int, delay: float
             print(f"   {agent_id}: PnL={performance['pnl']:.2f}, Trades={performance['trade_count']}")
         
     except Exception as e:
-        logger.error(f"❌ Simulation failed: {e}")
+        logger.error("❌ Simulation failed: %s", e)
         raise
 
 
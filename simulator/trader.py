@@ -4,13 +4,82 @@ Trader Agent Implementations
 Various trading strategies for AMM interaction
 """
 
-from typing import Dict, Any, Optional, List
-from .agent_base import AgentBase
+from collections import deque
+from typing import Callable, Dict, Any, Optional, List, Tuple
+import numpy as np
+import requests
+from eth_abi.registry import registry as abi_registry
+from eth_utils import function_signature_to_4byte_selector
+from web3.exceptions import Web3Exception
+from .agent_base import (AgentBase, DEFAULT_POLL_LATENCY, TRADE_HISTORY_CAPACITY, TransactionFailedError,
+                         get_contract)
+from .rpc import batch_requests
 import logging
 import math
 
 logger = logging.getLogger(__name__)
 
+SWAP_SEL = function_signature_to_4byte_selector(
+    'swapExactTokensForTokens(uint256,uint256,address,address)'
+)
+_enc_swap = abi_registry.get_encoder('(uint256,uint256,address,address)')
+ATOMIC_ROUND_TRIP_SEL = function_signature_to_4byte_selector(
+    'atomicRoundTrip(address,address,uint256,uint256)'
+)
+_enc_round_trip = abi_registry.get_encoder('(address,address,uint256,uint256)')
+
+# Pool prices and momentum are fixed-point integers with this many units per 1.0
+PRICE_SCALE = 10**18
+
+# Specialized step() body: (trader, market_data) -> actions
+StepFn = Callable[[Any, Dict[str, Any]], Dict[str, Any]]
+
+# Per-trader counters, stored as rows of one table so totals are column sums
+TRADE_STATS_DTYPE = np.dtype([
+    ('succ', 'i4'),
+    ('fail', 'i4'),
+    ('vol', 'f8'),
+    ('slip', 'f8')
+])
+
+# AMM fees are quoted in basis points
+FEE_DENOMINATOR = 10000
+
+# Failures a trade can hit against a live node: reverts and other web3 errors
+# (ContractLogicError, TimeExhausted, ...), JSON-RPC errors (raised as
+# ValueError) and transport errors. Anything else is a bug and propagates
+TRADE_ERRORS = (Web3Exception, ValueError, requests.RequestException, TransactionFailedError)
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee_bps: int) -> int:
+    """Constant-product swap output, mirroring AMM._getAmountOut"""
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in_with_fee = amount_in * (FEE_DENOMINATOR - fee_bps)
+    numerator = amount_in_with_fee * reserve_out
+    denominator = reserve_in * FEE_DENOMINATOR + amount_in_with_fee
+    return numerator // denominator
+
+def round_trip_profit(amount_in: int, reserve_a: int, reserve_b: int,
+                      fee_bps: int) -> Tuple[int, float]:
+    """
+    Profit from swapping A->B->A against the same reserves
+    
+    Args:
+        amount_in: Amount of token A swapped in
+        reserve_a: Pool reserve of token A
+        reserve_b: Pool reserve of token B
+        fee_bps: Swap fee in basis points
+        
+    Returns:
+        (profit in token A, profit as a fraction of amount_in); zero if the
+        first leg yields nothing
+    """
+    b_received = get_amount_out(amount_in, reserve_a, reserve_b, fee_bps)
+    if b_received <= 0:
+        return 0, 0.0
+    profit = get_amount_out(b_received, reserve_b, reserve_a, fee_bps) - amount_in
+    return profit, profit / amount_in
+
 class Trader(AgentBase):
     """
     Base trader class with common trading functionality
@@ -26,7 +95,9 @@ class Trader(AgentBase):
                  token_b_address: str,
                  initial_balance: Dict[str, float] = None,
                  slippage_tolerance: float = 0.05,
-                 random_seed: Optional[int] = None):
+                 random_seed: Optional[int] = None,
+                 poll_latency: float = DEFAULT_POLL_LATENCY,
+                 trade_history_capacity: int = TRADE_HISTORY_CAPACITY):
         """
         Initialize trader agent
         
@@ -36,62 +107,164 @@ class Trader(AgentBase):
             token_b_address: Second token address
             slippage_tolerance: Maximum acceptable slippage (5% default)
         """
-        super().__init__(agent_id, private_key, w3, contracts, initial_balance, random_seed)
+        super().__init__(agent_id, private_key, w3, contracts, initial_balance,
+                         random_seed, poll_latency, trade_history_capacity)
         
         self.amm_address = amm_address
         self.token_a_address = token_a_address
         self.token_b_address = token_b_address
         self.slippage_tolerance = slippage_tolerance
         
-        # AMM contract instance
-        self.amm_contract = self.w3.eth.contract(
-            address=amm_address,
-            abi=contracts['AMM']['abi']
-        )
+        # AMM contract instance, shared with other agents
+        self.amm_contract = get_contract(self.w3, amm_address, contracts['AMM']['abi'])
+        
+        # Bound contract functions, resolved from the ABI once
+        self._fn_get_reserves = self.amm_contract.functions.getReserves
+        self._fn_get_amount_out = self.amm_contract.functions.getAmountOut
+        
+        # Swap fee in basis points; None falls back to the getAmountOut RPC
+        try:
+            self.fee_bps: Optional[int] = self.amm_contract.functions.fee().call()
+        except TRADE_ERRORS as e:
+            logger.warning("Could not read fee for AMM %s, quoting swaps on-chain: %s", amm_address, e)
+            self.fee_bps = None
+        
+        # Reserves memoized per block: (block_number, reserve_a, reserve_b)
+        self._reserves_cache: Optional[Tuple[int, int, int]] = None
+        # Balances and reserves read in one batch at the start of step()
+        self._step_state: Optional[Dict[str, int]] = None
+        
+        # step() body specialized on the trading parameters; cleared whenever
+        # one of them is set, and rebuilt on the next step
+        self._step_fn: Optional[StepFn] = None
         
         # Trading parameters
         self.min_trade_size = 1000  # Minimum trade size in wei
         self.max_trade_size_ratio = 0.1  # Max 10% of balance per trade
         
-        # Performance tracking
-        self.successful_trades = 0
-        self.failed_trades = 0
-        self.total_volume = 0.0
-        self.total_slippage = 0.0
+        # Performance tracking; a record view into a runner-owned table once
+        # bind_stats is called
+        self._stats = np.zeros(1, dtype=TRADE_STATS_DTYPE)[0]
         
-        logger.info(f"📈 Trader {agent_id} initialized for AMM {amm_address}")
+        logger.info("📈 Trader %s initialized for AMM %s", agent_id, amm_address)
+    
+    @property
+    def min_trade_size(self) -> int:
+        return self._min_trade_size
+    
+    @min_trade_size.setter
+    def min_trade_size(self, value: int):
+        self._min_trade_size = value
+        self._step_fn = None
+    
+    @property
+    def max_trade_size_ratio(self) -> float:
+        return self._max_trade_size_ratio
+    
+    @max_trade_size_ratio.setter
+    def max_trade_size_ratio(self, value: float):
+        self._max_trade_size_ratio = value
+        self._step_fn = None
+    
+    def _get_reserves(self) -> Tuple[int, int]:
+        """Pool reserves (reserve_a, reserve_b), read once per block"""
+        block_number, _ = self._current_block()
+        if self._reserves_cache is not None and self._reserves_cache[0] == block_number:
+            return self._reserves_cache[1:]
+        reserves = self._fn_get_reserves().call()
+        self._reserves_cache = (block_number, reserves[0], reserves[1])
+        return reserves[0], reserves[1]
+    
+    def bind_stats(self, table: np.ndarray, index: int):
+        """Keep this trader's counters in row index of a shared TRADE_STATS_DTYPE table"""
+        table[index] = self._stats
+        self._stats = table[index]
+    
+    @property
+    def successful_trades(self) -> int:
+        return int(self._stats['succ'])
+    
+    @property
+    def failed_trades(self) -> int:
+        return int(self._stats['fail'])
+    
+    @property
+    def total_volume(self) -> float:
+        return float(self._stats['vol'])
+    
+    @property
+    def total_slippage(self) -> float:
+        return float(self._stats['slip'])
+    
+    def _fetch_step_state(self) -> Dict[str, int]:
+        """
+        Read both token balances and the pool reserves in one round trip
+        Balance and reserve reads later in the same block are served from it
+        """
+        block_number, _ = self._current_block()
+        address = self.address
+        with batch_requests(self.w3) as batch:
+            batch.add_call(self._get_token(self.token_a_address), 'balanceOf', address)
+            batch.add_call(self._get_token(self.token_b_address), 'balanceOf', address)
+            batch.add_call(self.amm_contract, 'getReserves')
+            balance_a, balance_b, (reserve_a, reserve_b) = batch.execute()
+        
+        self._reserves_cache = (block_number, reserve_a, reserve_b)
+        self._step_state = {
+            'block_number': block_number,
+            'balance_a': balance_a,
+            'balance_b': balance_b,
+            'reserve_a': reserve_a,
+            'reserve_b': reserve_b
+        }
+        return self._step_state
+    
+    def _prepare_state(self) -> Dict[str, int]:
+        """Step state for the current block, fetched only if should_act hasn't already"""
+        state = self._step_state
+        if state is not None and state['block_number'] == self._current_block()[0]:
+            return state
+        return self._fetch_step_state()
+    
+    def get_token_balance(self, token_address: str) -> int:
+        """Get ERC20 token balance, from the step state while it is current"""
+        state = self._step_state
+        if state is not None and state['block_number'] == self._current_block()[0]:
+            if token_address == self.token_a_address:
+                return state['balance_a']
+            if token_address == self.token_b_address:
+                return state['balance_b']
+        return super().get_token_balance(token_address)
     
-    def get_pool_price(self) -> float:
-        """Get current pool price (token A per token B)"""
+    def get_pool_price(self) -> int:
+        """Get current pool price (token A per token B, scaled by PRICE_SCALE)"""
         try:
-            reserves = self.amm_contract.functions.getReserves().call()
-            reserve_a, reserve_b = reserves[0], reserves[1]
+            reserve_a, reserve_b = self._get_reserves()
             
             if reserve_b == 0:
-                return 0.0
+                return 0
             
-            return reserve_a / reserve_b
-        except Exception as e:
-            logger.error(f"Failed to get pool price: {e}")
-            return 0.0
+            return reserve_a * PRICE_SCALE // reserve_b
+        except TRADE_ERRORS as e:
+            logger.error("Failed to get pool price: %s", e, exc_info=True)
+            return 0
     
     def calculate_swap_output(self, amount_in: int, token_in: str) -> int:
         """Calculate expected output for a swap"""
         try:
-            reserves = self.amm_contract.functions.getReserves().call()
-            reserve_a, reserve_b = reserves[0], reserves[1]
+            reserve_a, reserve_b = self._get_reserves()
             
             if token_in == self.token_a_address:
-                return self.amm_contract.functions.getAmountOut(
-                    amount_in, reserve_a, reserve_b
-                ).call()
+                reserve_in, reserve_out = reserve_a, reserve_b
             else:
-                return self.amm_contract.functions.getAmountOut(
-                    amount_in, reserve_b, reserve_a
-                ).call()
+                reserve_in, reserve_out = reserve_b, reserve_a
+            
+            if self.fee_bps is None:
+                return self._fn_get_amount_out(amount_in, reserve_in, reserve_out).call()
+            return get_amount_out(amount_in, reserve_in, reserve_out, self.fee_bps)
                 
-        except Exception as e:
-            logger.error(f"Failed to calculate swap output: {e}")
+        except TRADE_ERRORS as e:
+            logger.error("Failed to calculate swap output: %s", e, exc_info=True)
             return 0
     
     def calculate_slippage(self, expected_output: int, actual_output: int) -> float:
@@ -122,18 +295,18 @@ class Trader(AgentBase):
                 expected_output = self.calculate_swap_output(amount_in, token_in)
                 min_amount_out = int(expected_output * (1 - self.slippage_tolerance))
             
-            # Approve token spending
-            self.approve_token_spending(token_in, self.amm_address, amount_in)
+            # Approve token spending only if the remaining allowance is short
+            self.ensure_allowance(token_in, self.amm_address, amount_in)
             
-            # Execute swap
-            transaction = self.amm_contract.functions.swapExactTokensForTokens(
-                amount_in,
-                min_amount_out,
-                token_in,
-                self.address
-            ).build_transaction({})
+            # Execute swap; calldata is encoded directly, sender, nonce, fees and
+            # gas come from the agent's cached chain state
+            transaction = {
+                'to': self.amm_address,
+                'data': SWAP_SEL + _enc_swap((amount_in, min_amount_out, token_in, self.address))
+            }
             
             tx_hash = self.send_transaction(transaction)
+            self.spend_allowance(token_in, self.amm_address, amount_in)
             
             # Log the trade
             token_out = self.token_b_address if token_in == self.token_a_address else self.token_a_address
@@ -145,14 +318,15 @@ class Trader(AgentBase):
                 'tx_hash': tx_hash
             })
             
-            self.successful_trades += 1
-            self.total_volume += amount_in
+            stats = self._stats
+            stats['succ'] += 1
+            stats['vol'] += amount_in
             
             return tx_hash
             
-        except Exception as e:
-            logger.error(f"Swap failed for trader {self.agent_id}: {e}")
-            self.failed_trades += 1
+        except TRADE_ERRORS as e:
+            logger.error("Swap failed for trader %s: %s", self.agent_id, e, exc_info=True)
+            self._stats['fail'] += 1
             return None
     
     def should_act(self, market_data: Dict[str, Any]) -> bool:
@@ -160,12 +334,28 @@ class Trader(AgentBase):
         return False
     
     def step(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Base implementation - to be overridden by specific strategies"""
-        return {
-            'agent_id': self.agent_id,
-            'agent_type': 'trader',
-            'actions_taken': []
-        }
+        """Run the strategy's step function, rebuilt only after a parameter changes"""
+        step_fn = self._step_fn
+        if step_fn is None:
+            step_fn = self._step_fn = self._build_step()
+        return step_fn(self, market_data)
+    
+    def _build_step(self) -> StepFn:
+        """
+        Build step()'s body with this trader's parameters and methods closed
+        over; the trader is passed per call, so the closure never references it
+        Base implementation - to be overridden by specific strategies
+        """
+        agent_id = self.agent_id
+        
+        def step(trader: 'Trader', market_data: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                'agent_id': agent_id,
+                'agent_type': 'trader',
+                'actions_taken': []
+            }
+        
+        return step
 
 
 class RandomTrader(Trader):
@@ -184,40 +374,63 @@ class RandomTrader(Trader):
         super().__init__(*args, **kwargs)
         self.trade_frequency = trade_frequency
         
+        # Bound once; should_act runs for every trader every step
+        self._next_uniform = self.next_uniform
+        
     def should_act(self, market_data: Dict[str, Any]) -> bool:
         """Act randomly based on trade frequency"""
-        return self.random.random() < self.trade_frequency
+        return self._next_uniform() < self.trade_frequency
     
-    def step(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_step(self) -> StepFn:
+        """Specialize step() on this trader's tokens and trade-size limits"""
+        return _make_random_step(type(self), self.agent_id, self.token_a_address,
+                                 self.token_b_address, self.min_trade_size,
+                                 self.max_trade_size_ratio)
+
+
+def _make_random_step(cls: type, agent_id: str, token_a: str, token_b: str,
+                      min_size: int, ratio: float) -> StepFn:
+    """
+    Build a RandomTrader's step() with its parameters and methods closed over,
+    so the per-step path reads closure cells instead of instance attributes
+    """
+    prepare_state = cls._prepare_state
+    next_uniform = cls.next_uniform
+    scale_uniform = cls.scale_uniform
+    execute_swap = cls.execute_swap
+    
+    def step(trader: RandomTrader, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute random trading step"""
         actions = {
-            'agent_id': self.agent_id,
+            'agent_id': agent_id,
             'agent_type': 'random_trader',
             'actions_taken': []
         }
         
         try:
             # Get current balances
-            balance_a = self.get_token_balance(self.token_a_address)
-            balance_b = self.get_token_balance(self.token_b_address)
+            state = prepare_state(trader)
+            balance_a, balance_b = state['balance_a'], state['balance_b']
             
             # Choose a random token to trade (if we have balance)
             tradeable_tokens = []
-            if balance_a > self.min_trade_size:
-                tradeable_tokens.append((self.token_a_address, balance_a))
-            if balance_b > self.min_trade_size:
-                tradeable_tokens.append((self.token_b_address, balance_b))
+            if balance_a > min_size:
+                tradeable_tokens.append((token_a, balance_a))
+            if balance_b > min_size:
+                tradeable_tokens.append((token_b, balance_b))
             
             if not tradeable_tokens:
                 return actions
             
             # Select random token and amount
-            token_in, balance = self.random.choice(tradeable_tokens)
-            max_trade_amount = int(balance * self.max_trade_size_ratio)
-            trade_amount = self.random.randint(self.min_trade_size, max_trade_amount)
+            token_u = next_uniform(trader)
+            amount_u = next_uniform(trader)
+            token_in, balance = tradeable_tokens[int(token_u * len(tradeable_tokens))]
+            max_trade_amount = int(balance * ratio)
+            trade_amount = scale_uniform(amount_u, min_size, max_trade_amount)
             
             # Execute swap
-            tx_hash = self.execute_swap(trade_amount, token_in)
+            tx_hash = execute_swap(trader, trade_amount, token_in)
             
             if tx_hash:
                 actions['actions_taken'].append({
@@ -227,11 +440,13 @@ class RandomTrader(Trader):
                     'tx_hash': tx_hash
                 })
             
-        except Exception as e:
-            logger.error(f"Random trader {self.agent_id} step failed: {e}")
+        except TRADE_ERRORS as e:
+            logger.error("Random trader %s step failed: %s", agent_id, e, exc_info=True)
             actions['error'] = str(e)
         
         return actions
+    
+    return step
 
 
 class MomentumTrader(Trader):
@@ -258,94 +473,180 @@ class MomentumTrader(Trader):
         self.momentum_threshold = momentum_threshold
         self.trade_frequency = trade_frequency
         
-        # Price history for momentum calculation
-        self.price_history = []
+        # Price history for momentum calculation, bounded so appends never trim
+        self.price_history = deque(maxlen=lookback_periods * 2)
+        
+        # Shared history maintained by a MomentumSignal, if one adopts this trader
+        self.momentum_signal: Optional['MomentumSignal'] = None
+        self._signal_index = 0
+        
+    @property
+    def momentum_threshold(self) -> float:
+        return self._momentum_threshold
+    
+    @momentum_threshold.setter
+    def momentum_threshold(self, value: float):
+        self._momentum_threshold = value
+        self._step_fn = None
+    
+    def calculate_momentum(self) -> int:
+        """Calculate price momentum over lookback period (scaled by PRICE_SCALE)"""
+        if self.momentum_signal is not None:
+            return int(self.momentum_signal.momentum[self._signal_index] * PRICE_SCALE)
         
-    def calculate_momentum(self) -> float:
-        """Calculate price momentum over lookback period"""
         if len(self.price_history) < self.lookback_periods:
-            return 0.0
+            return 0
         
-        recent_prices = self.price_history[-self.lookback_periods:]
+        old_price = self.price_history[-self.lookback_periods]
         
-        if recent_prices[0] == 0:
-            return 0.0
+        if old_price == 0:
+            return 0
         
         # Simple momentum: (current_price - old_price) / old_price
-        momentum = (recent_prices[-1] - recent_prices[0]) / recent_prices[0]
+        momentum = (self.price_history[-1] - old_price) * PRICE_SCALE // old_price
         return momentum
     
     def should_act(self, market_data: Dict[str, Any]) -> bool:
         """Act based on momentum and random frequency"""
-        # Update price history
-        current_price = self.get_pool_price()
-        self.price_history.append(current_price)
-        
-        # Keep only required history
-        if len(self.price_history) > self.lookback_periods * 2:
-            self.price_history = self.price_history[-self.lookback_periods:]
+        # Update price history (a shared signal is updated by the runner); the
+        # reserves come from the same batch step() will use
+        if self.momentum_signal is None:
+            self._prepare_state()
+            self.price_history.append(self.get_pool_price())
         
         # Check if we have enough history and momentum exceeds threshold
         momentum = self.calculate_momentum()
-        has_momentum = abs(momentum) > self.momentum_threshold
+        has_momentum = abs(momentum) > int(self.momentum_threshold * PRICE_SCALE)
         
         # Combine momentum signal with random trading
-        return has_momentum or (self.random.random() < self.trade_frequency)
+        return has_momentum or (self.next_uniform() < self.trade_frequency)
     
-    def step(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_step(self) -> StepFn:
+        """Specialize step() on this trader's tokens, trade size and threshold"""
+        return _make_momentum_step(type(self), self.agent_id, self.token_a_address,
+                                   self.token_b_address, self.min_trade_size,
+                                   self.max_trade_size_ratio,
+                                   int(self.momentum_threshold * PRICE_SCALE))
+
+
+def _make_momentum_step(cls: type, agent_id: str, token_a: str, token_b: str,
+                        min_size: int, ratio: float, threshold: int) -> StepFn:
+    """
+    Build a MomentumTrader's step() with its parameters and methods closed over
+    The momentum signal is adopted after construction, so it is read per step
+    """
+    calculate_momentum = cls.calculate_momentum
+    prepare_state = cls._prepare_state
+    execute_swap = cls.execute_swap
+    
+    def step(trader: MomentumTrader, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute momentum trading step"""
         actions = {
-            'agent_id': self.agent_id,
+            'agent_id': agent_id,
             'agent_type': 'momentum_trader',
             'actions_taken': []
         }
         
         try:
-            momentum = self.calculate_momentum()
+            momentum = calculate_momentum(trader)
             
             # Get current balances
-            balance_a = self.get_token_balance(self.token_a_address)
-            balance_b = self.get_token_balance(self.token_b_address)
-            
-            trade_executed = False
+            state = prepare_state(trader)
+            balance_a, balance_b = state['balance_a'], state['balance_b']
             
             # Positive momentum: buy token A (price of A increasing relative to B)
-            if momentum > self.momentum_threshold and balance_b > self.min_trade_size:
-                trade_amount = int(balance_b * self.max_trade_size_ratio)
-                tx_hash = self.execute_swap(trade_amount, self.token_b_address)
+            if momentum > threshold and balance_b > min_size:
+                trade_amount = int(balance_b * ratio)
+                tx_hash = execute_swap(trader, trade_amount, token_b)
                 
                 if tx_hash:
                     actions['actions_taken'].append({
                         'action': 'momentum_buy_a',
-                        'momentum': momentum,
+                        'momentum': momentum / PRICE_SCALE,
                         'amount': trade_amount,
                         'tx_hash': tx_hash
                     })
-                    trade_executed = True
             
             # Negative momentum: sell token A (price of A decreasing relative to B)
-            elif momentum < -self.momentum_threshold and balance_a > self.min_trade_size:
-                trade_amount = int(balance_a * self.max_trade_size_ratio)
-                tx_hash = self.execute_swap(trade_amount, self.token_a_address)
+            elif momentum < -threshold and balance_a > min_size:
+                trade_amount = int(balance_a * ratio)
+                tx_hash = execute_swap(trader, trade_amount, token_a)
                 
                 if tx_hash:
                     actions['actions_taken'].append({
                         'action': 'momentum_sell_a',
-                        'momentum': momentum,
+                        'momentum': momentum / PRICE_SCALE,
                         'amount': trade_amount,
                         'tx_hash': tx_hash
                     })
-                    trade_executed = True
             
             # Add momentum info to actions
-            actions['momentum'] = momentum
-            actions['price_history_length'] = len(self.price_history)
+            signal = trader.momentum_signal
+            actions['momentum'] = momentum / PRICE_SCALE
+            actions['price_history_length'] = (
+                signal.count if signal is not None else len(trader.price_history)
+            )
             
-        except Exception as e:
-            logger.error(f"Momentum trader {self.agent_id} step failed: {e}")
+        except TRADE_ERRORS as e:
+            logger.error("Momentum trader %s step failed: %s", agent_id, e, exc_info=True)
             actions['error'] = str(e)
         
         return actions
+    
+    return step
+
+
+class MomentumSignal:
+    """
+    Pool price history shared by momentum traders on the same AMM
+    The price is read once per step and every trader's momentum is computed
+    in one NumPy pass, whatever its lookback
+    """
+    
+    def __init__(self, traders: List[MomentumTrader]):
+        """
+        Initialize signal
+        
+        Args:
+            traders: Momentum traders sharing one AMM pool
+        """
+        self.traders = traders
+        n = len(traders)
+        self.lookbacks = np.fromiter((t.lookback_periods for t in traders), np.int64, n)
+        # Oldest price first; only the longest lookback is ever needed
+        self.prices = np.zeros(int(self.lookbacks.max()) if n else 1)
+        self.count = 0
+        self.momentum = np.zeros(n)
+        
+        for i, trader in enumerate(traders):
+            trader.momentum_signal = self
+            trader._signal_index = i
+    
+    def __len__(self) -> int:
+        return len(self.traders)
+    
+    def update(self, price: int) -> np.ndarray:
+        """
+        Append this step's pool price and recompute every trader's momentum
+        
+        Args:
+            price: Current pool price (Trader.get_pool_price)
+            
+        Returns:
+            Momentum per trader as a fraction, 0 until a trader has a full
+            lookback window
+        """
+        prices = self.prices
+        prices[:-1] = prices[1:]
+        # Scaled prices can exceed int64, so the window is float64
+        prices[-1] = current = float(price)
+        self.count += 1
+        
+        old = prices[len(prices) - self.lookbacks]
+        valid = (self.lookbacks <= self.count) & (old != 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.momentum = np.where(valid, (current - old) / old, 0.0)
+        return self.momentum
 
 
 class ArbitrageTrader(Trader):
@@ -365,68 +666,181 @@ class ArbitrageTrader(Trader):
         """
         super().__init__(*args, **kwargs)
         self.min_profit_threshold = min_profit_threshold
+        # (block_number, opportunity) from the last should_act, reused by step()
+        self._last_decision: Optional[Tuple[int, Optional[Dict[str, Any]]]] = None
+        
+        # Last search result keyed on (reserve_a, reserve_b, balance_a), its only inputs
+        self._last_arb_key: Optional[Tuple[int, int, int]] = None
+        self._last_arb_result: Optional[Dict[str, Any]] = None
         
+        # Helper that swaps both legs in one transaction (older deployments lack it)
+        round_trip_info = self.contracts.get('RoundTripArbitrage')
+        self.round_trip_address = round_trip_info['address'] if round_trip_info else None
+        
+    @property
+    def min_profit_threshold(self) -> float:
+        return self._min_profit_threshold
+    
+    @min_profit_threshold.setter
+    def min_profit_threshold(self, value: float):
+        self._min_profit_threshold = value
+        self._step_fn = None
+        # A cached search was judged against the old threshold
+        self._last_arb_key = None
+    
     def find_arbitrage_opportunity(self) -> Optional[Dict[str, Any]]:
         """
         Find arbitrage opportunities
         In a single AMM, this is limited, but can detect optimal trade sizes
         """
         try:
-            current_price = self.get_pool_price()
+            state = self._prepare_state()
+            reserve_a, reserve_b = self._get_reserves()
+            balance_a = state['balance_a']
+            
+            # Quiet pools leave the inputs unchanged between steps
+            key = (reserve_a, reserve_b, balance_a)
+            if key == self._last_arb_key:
+                return self._last_arb_result
+            
+            opportunity = None
             
             # Simple check: if we can make a profitable round trip
             # This is more theoretical as single AMM arbitrage is limited
-            balance_a = self.get_token_balance(self.token_a_address)
-            balance_b = self.get_token_balance(self.token_b_address)
-            
             if balance_a > self.min_trade_size:
                 # Simulate A->B->A round trip
                 test_amount = int(balance_a * 0.1)  # Test with 10% of balance
                 
-                # A -> B
-                b_received = self.calculate_swap_output(test_amount, self.token_a_address)
+                if self.fee_bps is not None:
+                    profit, profit_percentage = round_trip_profit(
+                        test_amount, reserve_a, reserve_b, self.fee_bps
+                    )
+                else:
+                    # A -> B, then B -> A, quoted on-chain
+                    profit, profit_percentage = 0, 0.0
+                    b_received = self.calculate_swap_output(test_amount, self.token_a_address)
+                    if b_received > 0:
+                        a_received = self.calculate_swap_output(b_received, self.token_b_address)
+                        profit = a_received - test_amount
+                        profit_percentage = profit / test_amount
                 
-                if b_received > 0:
-                    # B -> A
-                    a_received = self.calculate_swap_output(b_received, self.token_b_address)
-                    
-                    profit = a_received - test_amount
-                    profit_percentage = profit / test_amount if test_amount > 0 else 0
-                    
-                    if profit_percentage > self.min_profit_threshold:
-                        return {
-                            'direction': 'a_to_b_to_a',
-                            'amount': test_amount,
-                            'expected_profit': profit,
-                            'profit_percentage': profit_percentage
-                        }
+                if profit_percentage > self.min_profit_threshold:
+                    opportunity = {
+                        'direction': 'a_to_b_to_a',
+                        'amount': test_amount,
+                        'expected_profit': profit,
+                        'profit_percentage': profit_percentage
+                    }
             
+            self._last_arb_key, self._last_arb_result = key, opportunity
+            return opportunity
+            
+        except TRADE_ERRORS as e:
+            logger.error("Failed to find arbitrage opportunity: %s", e, exc_info=True)
             return None
+    
+    def execute_atomic_arb(self, amount_in: int, min_profit: int) -> Optional[str]:
+        """
+        Run the A->B->A round trip as one transaction through RoundTripArbitrage
+        The helper reverts unless at least amount_in + min_profit comes back,
+        so a stale opportunity costs gas but never a losing trade
+        
+        Args:
+            amount_in: Amount of token A to round-trip
+            min_profit: Minimum profit in token A
+            
+        Returns:
+            Transaction hash if successful
+        """
+        try:
+            token_in = self.token_a_address
+            self.ensure_allowance(token_in, self.round_trip_address, amount_in)
+            
+            transaction = {
+                'to': self.round_trip_address,
+                'data': ATOMIC_ROUND_TRIP_SEL + _enc_round_trip(
+                    (self.amm_address, token_in, amount_in, amount_in + min_profit)
+                )
+            }
+            
+            tx_hash = self.send_transaction(transaction)
+            self.spend_allowance(token_in, self.round_trip_address, amount_in)
+            
+            self.log_trade('ROUND_TRIP', {
+                'amount_in': amount_in,
+                'token_in': token_in,
+                'min_profit': min_profit,
+                'tx_hash': tx_hash
+            })
+            
+            stats = self._stats
+            stats['succ'] += 1
+            stats['vol'] += amount_in
             
-        except Exception as e:
-            logger.error(f"Failed to find arbitrage opportunity: {e}")
+            return tx_hash
+            
+        except TRADE_ERRORS as e:
+            logger.error("Atomic arbitrage failed for trader %s: %s", self.agent_id, e, exc_info=True)
+            self._stats['fail'] += 1
             return None
     
     def should_act(self, market_data: Dict[str, Any]) -> bool:
         """Act if arbitrage opportunity exists"""
         opportunity = self.find_arbitrage_opportunity()
+        self._last_decision = (self._current_block()[0], opportunity)
         return opportunity is not None
     
-    def step(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_step(self) -> StepFn:
+        """Specialize step() on this trader's token, helper contract and profit threshold"""
+        return _make_arbitrage_step(type(self), self.agent_id, self.token_a_address,
+                                    self.round_trip_address, self.min_profit_threshold)
+
+
+def _make_arbitrage_step(cls: type, agent_id: str, token_a: str,
+                         round_trip_address: Optional[str],
+                         min_profit_threshold: float) -> StepFn:
+    """
+    Build an ArbitrageTrader's step() with its parameters and methods closed over
+    The last should_act decision changes every block, so it is read per step
+    """
+    current_block = cls._current_block
+    find_opportunity = cls.find_arbitrage_opportunity
+    execute_atomic_arb = cls.execute_atomic_arb
+    execute_swap = cls.execute_swap
+    
+    def step(trader: ArbitrageTrader, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute arbitrage trading step"""
         actions = {
-            'agent_id': self.agent_id,
+            'agent_id': agent_id,
             'agent_type': 'arbitrage_trader',
             'actions_taken': []
         }
         
         try:
-            opportunity = self.find_arbitrage_opportunity()
+            # should_act already searched this block unless step() is called directly
+            decision = trader._last_decision
+            if decision is not None and decision[0] == current_block(trader)[0]:
+                opportunity = decision[1]
+            else:
+                opportunity = find_opportunity(trader)
             
-            if opportunity:
+            if opportunity and round_trip_address:
+                # Both legs in one transaction, profit re-checked on-chain
+                amount = opportunity['amount']
+                tx_hash = execute_atomic_arb(trader, amount, int(amount * min_profit_threshold))
+                
+                if tx_hash:
+                    actions['actions_taken'].append({
+                        'action': 'arbitrage_round_trip',
+                        'expected_profit': opportunity['expected_profit'],
+                        'profit_percentage': opportunity['profit_percentage'],
+                        'tx_hash': tx_hash
+                    })
+            
+            elif opportunity:
                 # Execute first leg of arbitrage
                 if opportunity['direction'] == 'a_to_b_to_a':
-                    tx_hash = self.execute_swap(opportunity['amount'], self.token_a_address)
+                    tx_hash = execute_swap(trader, opportunity['amount'], token_a)
                     
                     if tx_hash:
                         actions['actions_taken'].append({
@@ -436,11 +850,13 @@ class ArbitrageTrader(Trader):
                             'tx_hash': tx_hash
                         })
                         
-                        # Note: In practice, the second leg would be executed immediately
-                        # or in the next step. Here we simplify by just executing first leg
+                        # Without the RoundTripArbitrage helper only the first leg
+                        # is executed; the second would land a block later
             
-        except Exception as e:
-            logger.error(f"Arbitrage trader {self.agent_id} step failed: {e}")
+        except TRADE_ERRORS as e:
+            logger.error("Arbitrage trader %s step failed: %s", agent_id, e, exc_info=True)
             actions['error'] = str(e)
         
-        return actions
\ No newline at end of file
+        return actions
+    
+    return step
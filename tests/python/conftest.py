@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Shared test fixtures
+"""
+
+import subprocess
+import time
+import pytest
+from web3 import Web3
+from deploy import compile_contracts
+
+GANACHE_PORT = 8545
+
+
+@pytest.fixture(scope="session")
+def compiled_contracts():
+    """Compile the Solidity sources once for the whole test run"""
+    return compile_contracts()
+
+
+@pytest.fixture(scope="session")
+def ganache_url():
+    """Start one Ganache for the whole test run"""
+    # Nothing reads Ganache's per-request log; a pipe would fill up and block it
+    try:
+        process = subprocess.Popen([
+            'ganache-cli',
+            '--host', '0.0.0.0',
+            '--port', str(GANACHE_PORT),
+            '--deterministic',
+            '--accounts', '10',
+            '--defaultBalanceEther', '1000'
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        pytest.fail("ganache-cli not found")
+    url = f'http://localhost:{GANACHE_PORT}'
+    
+    try:
+        # Wait for Ganache to answer RPCs
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                pytest.fail(f"ganache exited with code {process.returncode} during startup")
+            try:
+                Web3(Web3.HTTPProvider(url)).eth.block_number
+                break
+            except Exception:
+                time.sleep(0.05)
+        else:
+            pytest.fail("ganache did not start")
+        
+        yield url
+        
+    finally:
+        # Cleanup
+        process.terminate()
+        process.wait()
+
+
+@pytest.fixture(scope="class")
+def isolated_chain(ganache_url):
+    """Ganache URL whose chain is reverted once the test class finishes"""
+    provider = Web3.HTTPProvider(ganache_url)
+    snapshot_id = provider.make_request('evm_snapshot', [])['result']
+    
+    yield ganache_url
+    
+    provider.make_request('evm_revert', [snapshot_id])
@@ -3,10 +3,9 @@
 Test deployment functionality
 """
 
+import asyncio
 import pytest
 import json
-import subprocess
-import time
 from pathlib import Path
 from web3 import Web3
 from deploy import ContractDeployer
@@ -14,42 +13,18 @@ from deploy import ContractDeployer
 class TestDeployment:
     """Test contract deployment"""
     
-    @pytest.fixture(scope="class")
-    def ganache_process(self):
-        """Start Ganache for testing"""
-        # Start Ganache
-        process = subprocess.Popen([
-            'ganache-cli',
-            '--host', '0.0.0.0',
-            '--port', '8545',
-            '--deterministic',
-            '--accounts', '10',
-            '--defaultBalanceEther', '1000'
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        
-        # Wait for Ganache to be ready
-        time.sleep(3)
-        
-        yield process
-        
-        # Cleanup
-        process.terminate()
-        process.wait()
-    
     @pytest.fixture
-    def deployer(self, ganache_process):
+    def deployer(self, isolated_chain):
         """Create deployer instance"""
-        return ContractDeployer('http://localhost:8545')
+        return ContractDeployer(isolated_chain)
     
     def test_web3_connection(self, deployer):
         """Test Web3 connection to Ganache"""
         assert deployer.w3.is_connected()
         assert deployer.w3.eth.block_number >= 0
     
-    def test_compile_contracts(self, deployer):
+    def test_compile_contracts(self, compiled_contracts):
         """Test contract compilation"""
-        compiled_contracts = deployer.compile_contracts()
-        
         expected_contracts = [
             'ERC20Token', 'ERC721Token', 'ERC1155Token', 
             'AMM', 'Router'
@@ -61,11 +36,9 @@ class TestDeployment:
             assert 'bytecode' in compiled_contracts[contract_name]
             assert len(compiled_contracts[contract_name]['bytecode']) > 0
     
-    def test_deploy_erc20_token(self, deployer):
+    def test_deploy_erc20_token(self, deployer, compiled_contracts):
         """Test ERC20 token deployment"""
-        compiled_contracts = deployer.compile_contracts()
-        
-        address, contract = deployer.deploy_erc20_token(compiled_contracts)
+        address, contract = asyncio.run(deployer.deploy_erc20_token(compiled_contracts))
         
         # Verify deployment
         assert Web3.is_address(address)
@@ -74,23 +47,21 @@ class TestDeployment:
         assert contract.functions.decimals().call() == 18
         assert contract.functions.totalSupply().call() > 0
     
-    def test_deploy_amm(self, deployer):
+    def test_deploy_amm(self, deployer, compiled_contracts):
         """Test AMM deployment"""
-        compiled_contracts = deployer.compile_contracts()
-        
         # Deploy tokens first
-        token_a_address, _ = deployer.deploy_erc20_token(compiled_contracts)
-        token_b_address, _ = deployer.deploy_contract(
+        token_a_address, _ = asyncio.run(deployer.deploy_erc20_token(compiled_contracts))
+        token_b_address, _ = asyncio.run(deployer.deploy_contract(
             'USDC',
             compiled_contracts['ERC20Token']['abi'],
             compiled_contracts['ERC20Token']['bytecode'],
             ("USD Coin", "USDC", 6, deployer.w3.to_wei(1000000, 'mwei'))
-        )
+        ))
         
         # Deploy AMM
-        amm_address, amm_contract = deployer.deploy_amm(
+        amm_address, amm_contract = asyncio.run(deployer.deploy_amm(
             compiled_contracts, token_a_address, token_b_address
-        )
+        ))
         
         # Verify AMM deployment
         assert Web3.is_address(amm_address)
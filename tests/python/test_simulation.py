@@ -5,8 +5,6 @@ Test simulation functionality
 
 import pytest
 import json
-import subprocess
-import time
 from pathlib import Path
 from simulator.run_simulation import SimulationRunner
 from simulator.agent_base import AgentBase
@@ -18,32 +16,13 @@ class TestSimulation:
     """Test simulation functionality"""
     
     @pytest.fixture(scope="class")
-    def deployed_contracts(self):
+    def deployed_contracts(self, isolated_chain):
         """Deploy contracts for testing"""
-        # Start Ganache
-        process = subprocess.Popen([
-            'ganache-cli',
-            '--host', '0.0.0.0',
-            '--port', '8546',  # Different port to avoid conflicts
-            '--deterministic',
-            '--accounts', '10',
-            '--defaultBalanceEther', '1000'
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        
-        time.sleep(3)  # Wait for Ganache to be ready
-        
-        try:
-            # Deploy contracts
-            deployer = ContractDeployer('http://localhost:8546')
-            success = deployer.deploy_all()
-            assert success
-            
-            yield 'deployed.json'
-            
-        finally:
-            # Cleanup
-            process.terminate()
-            process.wait()
+        deployer = ContractDeployer(isolated_chain)
+        success = deployer.deploy_all()
+        assert success
+        
+        return 'deployed.json'
     
     @pytest.fixture
     def simulation_config(self):
@@ -65,11 +44,11 @@ class TestSimulation:
             ]
         }
     
-    def test_simulation_runner_init(self, deployed_contracts, simulation_config):
+    def test_simulation_runner_init(self, ganache_url, deployed_contracts, simulation_config):
         """Test simulation runner initialization"""
         runner = SimulationRunner(
             simulation_config, 
-            'http://localhost:8546',
+            ganache_url,
             deployed_contracts
         )
         
@@ -77,11 +56,11 @@ class TestSimulation:
         assert runner.max_steps == 5
         assert runner.w3.is_connected()
     
-    def test_agent_creation(self, deployed_contracts, simulation_config):
+    def test_agent_creation(self, ganache_url, deployed_contracts, simulation_config):
         """Test agent creation and initialization"""
         runner = SimulationRunner(
             simulation_config, 
-            'http://localhost:8546',
+            ganache_url,
             deployed_contracts
         )
         
@@ -95,11 +74,11 @@ class TestSimulation:
             eth_balance = agent.get_eth_balance()
             assert eth_balance > 0  # Should have ETH from Ganache
     
-    def test_token_distribution(self, deployed_contracts, simulation_config):
+    def test_token_distribution(self, ganache_url, deployed_contracts, simulation_config):
         """Test initial token distribution to agents"""
         runner = SimulationRunner(
             simulation_config, 
-            'http://localhost:8546',
+            ganache_url,
             deployed_contracts
         )
         
@@ -114,11 +93,11 @@ class TestSimulation:
             assert balances.get('ERC20Token', 0) > 0 or balances.get('TEST', 0) > 0
             assert balances.get('USDC', 0) > 0
     
-    def test_simulation_step(self, deployed_contracts, simulation_config):
+    def test_simulation_step(self, ganache_url, deployed_contracts, simulation_config):
         """Test single simulation step execution"""
         runner = SimulationRunner(
             simulation_config, 
-            'http://localhost:8546',
+            ganache_url,
             deployed_contracts
         )
         
@@ -139,11 +118,11 @@ class TestSimulation:
         assert step_result['step'] == 0
         assert step_result['execution_time'] > 0
     
-    def test_full_simulation(self, deployed_contracts, simulation_config):
+    def test_full_simulation(self, ganache_url, deployed_contracts, simulation_config):
         """Test complete simulation run"""
         runner = SimulationRunner(
             simulation_config, 
-            'http://localhost:8546',
+            ganache_url,
             deployed_contracts
         )
         
@@ -172,11 +151,11 @@ class TestSimulation:
             assert 'transaction_count' in performance
             assert 'current_balances' in performance
     
-    def test_metrics_calculation(self, deployed_contracts, simulation_config):
+    def test_metrics_calculation(self, ganache_url, deployed_contracts, simulation_config):
         """Test metrics calculation"""
         runner = SimulationRunner(
             simulation_config, 
-            'http://localhost:8546',
+            ganache_url,
             deployed_contracts
         )
         
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test trading kernels, atomic arbitrage and JSON-RPC batching
+"""
+
+import pytest
+from simulator.rpc import batch_requests
+from simulator.run_simulation import DEFAULT_PRIVATE_KEYS
+from simulator.trader import ArbitrageTrader, get_amount_out, round_trip_profit
+from deploy import ContractDeployer
+
+# Liquidity seeded into the AMM (raw units: TEST has 18 decimals, USDC 6)
+POOL_TEST = 100_000 * 10**18
+POOL_USDC = 100_000 * 10**6
+
+class TestTrading:
+    """Test trading against a deployed AMM"""
+    
+    @pytest.fixture(scope="class")
+    def deployer(self, isolated_chain):
+        """Deploy contracts and seed the AMM with liquidity from the deployer"""
+        deployer = ContractDeployer(isolated_chain)
+        assert deployer.deploy_all()
+        
+        contracts = deployer.deployed_contracts
+        amm = contracts['AMM']['contract']
+        sender = {'from': deployer.deployer_address}
+        for name, amount in (('ERC20Token', POOL_TEST), ('USDC', POOL_USDC)):
+            tx_hash = contracts[name]['contract'].functions.approve(amm.address, amount).transact(sender)
+            deployer.w3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_hash = amm.functions.addLiquidity(
+            POOL_TEST, POOL_USDC, 0, 0, deployer.deployer_address
+        ).transact(sender)
+        deployer.w3.eth.wait_for_transaction_receipt(tx_hash)
+        
+        return deployer
+    
+    @pytest.fixture
+    def trader(self, deployer):
+        """Arbitrage trader on the deployer's account, which holds the token supply"""
+        contracts = {
+            name: {'address': info['address'], 'abi': info['abi']}
+            for name, info in deployer.deployed_contracts.items()
+        }
+        for name, decimals in deployer.token_decimals.items():
+            contracts[name]['decimals'] = decimals
+        
+        return ArbitrageTrader(
+            'arbitrage_trader_0',
+            DEFAULT_PRIVATE_KEYS[0],
+            deployer.w3,
+            contracts,
+            contracts['AMM']['address'],
+            contracts['ERC20Token']['address'],
+            contracts['USDC']['address']
+        )
+    
+    def test_get_amount_out_matches_amm(self, deployer):
+        """Test the swap kernel against AMM.getAmountOut"""
+        amm = deployer.deployed_contracts['AMM']['contract']
+        fee_bps = amm.functions.fee().call()
+        
+        cases = [
+            (1, POOL_TEST, POOL_USDC),
+            (10**18, POOL_TEST, POOL_USDC),
+            (12_345 * 10**6, POOL_USDC, POOL_TEST),
+            (POOL_TEST, POOL_TEST, POOL_USDC),
+            (3 * 10**30, 7 * 10**29, 5 * 10**28)
+        ]
+        for amount_in, reserve_in, reserve_out in cases:
+            expected = amm.functions.getAmountOut(amount_in, reserve_in, reserve_out).call()
+            assert get_amount_out(amount_in, reserve_in, reserve_out, fee_bps) == expected
+    
+    def test_round_trip_profit_matches_amm(self, deployer):
+        """Test the round trip kernel against two chained AMM.getAmountOut quotes"""
+        amm = deployer.deployed_contracts['AMM']['contract']
+        fee_bps = amm.functions.fee().call()
+        reserve_a, reserve_b = amm.functions.reserveA().call(), amm.functions.reserveB().call()
+        
+        amount_in = 1_000 * 10**18
+        b_received = amm.functions.getAmountOut(amount_in, reserve_a, reserve_b).call()
+        a_received = amm.functions.getAmountOut(b_received, reserve_b, reserve_a).call()
+        
+        profit, profit_percentage = round_trip_profit(amount_in, reserve_a, reserve_b, fee_bps)
+        assert profit == a_received - amount_in
+        assert profit_percentage == pytest.approx(profit / amount_in)
+        # Fees make a round trip through one pool a loss
+        assert profit < 0
+    
+    def test_atomic_arb_executes(self, deployer, trader):
+        """Test a round trip whose minimum return is met"""
+        token_a = deployer.deployed_contracts['ERC20Token']['contract']
+        reserve_a, reserve_b = trader._get_reserves()
+        amount_in = 1_000 * 10**18
+        profit, _ = round_trip_profit(amount_in, reserve_a, reserve_b, trader.fee_bps)
+        balance_before = token_a.functions.balanceOf(trader.address).call()
+        
+        # A single pool can't pay a profit, so accept exactly the predicted loss
+        tx_hash = trader.execute_atomic_arb(amount_in, profit)
+        
+        assert tx_hash is not None
+        assert token_a.functions.balanceOf(trader.address).call() == balance_before + profit
+        assert trader._stats['succ'] == 1
+        assert trader.trade_types == ['ROUND_TRIP']
+    
+    def test_atomic_arb_reverts_below_min_profit(self, deployer, trader):
+        """Test that a round trip short of its minimum reverts as a whole"""
+        token_a = deployer.deployed_contracts['ERC20Token']['contract']
+        reserve_a, reserve_b = trader._get_reserves()
+        amount_in = 1_000 * 10**18
+        profit, _ = round_trip_profit(amount_in, reserve_a, reserve_b, trader.fee_bps)
+        balance_before = token_a.functions.balanceOf(trader.address).call()
+        reserves_before = (reserve_a, reserve_b)
+        
+        # One unit more than the pool can return
+        tx_hash = trader.execute_atomic_arb(amount_in, profit + 1)
+        
+        assert tx_hash is None
+        assert token_a.functions.balanceOf(trader.address).call() == balance_before
+        assert trader._get_reserves() == reserves_before
+        assert trader._stats['fail'] == 1
+        assert len(trader.trade_history) == 0
+    
+    def test_rpc_batch_matches_single_calls(self, deployer):
+        """Test that a JSON-RPC batch returns what the equivalent single calls do"""
+        w3 = deployer.w3
+        token_a = deployer.deployed_contracts['ERC20Token']['contract']
+        amm = deployer.deployed_contracts['AMM']['contract']
+        owner = deployer.deployer_address
+        
+        with batch_requests(w3) as batch:
+            batch.add_call(token_a, 'name')
+            batch.add_call(token_a, 'balanceOf', owner)
+            batch.add_call(amm, 'fee')
+            batch.add_call(amm, 'getAmountOut', 10**18, POOL_TEST, POOL_USDC)
+            batch.add_balance(owner)
+            batch.add('eth_blockNumber', [], lambda raw: int(raw, 16))
+            results = batch.execute()
+        
+        assert results == [
+            token_a.functions.name().call(),
+            token_a.functions.balanceOf(owner).call(),
+            amm.functions.fee().call(),
+            amm.functions.getAmountOut(10**18, POOL_TEST, POOL_USDC).call(),
+            w3.eth.get_balance(owner),
+            w3.eth.block_number
+        ]